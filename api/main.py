@@ -27,6 +27,7 @@ except ImportError:
 import pathlib
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse, JSONResponse
 
@@ -100,6 +101,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON responses — the ledger and Master DB listings repeat the same
+# keys for every card and shrink several-fold; tiny responses are left alone
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 app.include_router(auth.router,      prefix="/api/auth",      tags=["auth"])
 app.include_router(cards.router,     prefix="/api/cards",     tags=["cards"])
 app.include_router(master_db.router, prefix="/api/master-db", tags=["master-db"])
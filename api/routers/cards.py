@@ -3,26 +3,50 @@
 import io
 import re
 import datetime
+import threading
 import hashlib
 import urllib.request
 import urllib.parse
 from typing import Optional
 
 import pandas as pd
+from cachetools import TTLCache
 from fastapi import APIRouter, HTTPException, BackgroundTasks, UploadFile, File
 from pydantic import BaseModel
 
+try:
+    from pyarrow.lib import ArrowInvalid  # pd.read_csv(engine="pyarrow") backend
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
 from dashboard_utils import (
     load_data, save_data, archive_card, restore_card, load_archive,
     load_price_history, load_all_price_history, append_price_history,
     load_card_results, load_all_card_results, save_card_results,
-    scrape_single_card, MONEY_COLS,
+    scrape_single_card, get_data_version, normalize_trend,
+    card_index, find_card,
 )
 
 router = APIRouter()
 
 DEFAULT_USER = "admin"
 
+# Serialized ledger keyed on (user, data version) — in-process writes bump the
+# version; the TTL bounds staleness from out-of-process scrapers.
+_cards_cache: TTLCache = TTLCache(maxsize=64, ttl=60)   # 1 min
+_history_cache: TTLCache = TTLCache(maxsize=64, ttl=60)  # 1 min
+_detail_cache: TTLCache = TTLCache(maxsize=256, ttl=60)  # 1 min
+_archive_cache: TTLCache = TTLCache(maxsize=64, ttl=60)  # 1 min
+_cache_lock = threading.Lock()
+
+# Cards scraped (or queued) recently, keyed on (user, card name). eBay sold
+# comps don't move within minutes, so repeat Rescrape clicks inside the TTL
+# skip the browser round-trip unless the caller passes force=true.
+SCRAPE_TTL = 900  # 15 min
+_recent_scrapes: TTLCache = TTLCache(maxsize=1024, ttl=SCRAPE_TTL)
+_scrape_lock = threading.Lock()
+
 
 def _normalise_row(r: dict) -> dict:
     """Convert a DataFrame row dict to the canonical API card shape."""
@@ -73,8 +97,17 @@ class CardCreate(BaseModel):
 @router.get("")
 def list_cards(user: str = DEFAULT_USER):
     """Return all cards in the collection for the ledger table."""
+    cache_key = (user, get_data_version(user))
+    with _cache_lock:
+        cached = _cards_cache.get(cache_key)
+    if cached:
+        return cached
+
     df = load_data(user)
-    return {"cards": [_normalise_row(r) for r in df.fillna("").to_dict(orient="records")]}
+    result = {"cards": [_normalise_row(r) for r in df.fillna("").to_dict(orient="records")]}
+    with _cache_lock:
+        _cards_cache[cache_key] = result
+    return result
 
 
 @router.get("/portfolio-history")
@@ -85,7 +118,17 @@ def portfolio_history(user: str = DEFAULT_USER):
     only cards currently in the collection. Archived cards are excluded so a
     card added then removed within a day won't cause a spike. Today's live
     values are always appended as the final data point.
+
+    The aggregate only depends on the stored data, so it is cached per
+    (user, data version, day) like the ledger listing.
     """
+    today = datetime.date.today().isoformat()
+    cache_key = (user, get_data_version(user), today)
+    with _cache_lock:
+        cached = _history_cache.get(cache_key)
+    if cached:
+        return cached
+
     df = load_data(user)
     current_cards = set(df["Card Name"].tolist())
 
@@ -104,7 +147,6 @@ def portfolio_history(user: str = DEFAULT_USER):
                 bucket["count"] += 1
 
     # Always include today's live values as the rightmost point
-    today = datetime.date.today().isoformat()
     try:
         today_vals = df["Fair Value"].fillna(0).astype(float)
         today_total = round(float(today_vals.sum()), 2)
@@ -123,12 +165,24 @@ def portfolio_history(user: str = DEFAULT_USER):
         }
         for d, b in sorted(date_totals.items())
     ]
-    return {"history": history}
+    result = {"history": history}
+    with _cache_lock:
+        _history_cache[cache_key] = result
+    return result
 
 
 @router.get("/archive")
 def list_archive(user: str = DEFAULT_USER):
-    """Return all soft-deleted (archived) cards."""
+    """Return all soft-deleted (archived) cards.
+
+    Cached per (user, data version) — archiving and restoring bump the version.
+    """
+    cache_key = (user, get_data_version(user))
+    with _cache_lock:
+        cached = _archive_cache.get(cache_key)
+    if cached:
+        return cached
+
     try:
         archive_df = load_archive(user)
         cards = [
@@ -139,22 +193,35 @@ def list_archive(user: str = DEFAULT_USER):
             }
             for r in archive_df.fillna("").to_dict(orient="records")
         ]
-        return {"cards": cards}
     except Exception:
         return {"cards": []}
+    result = {"cards": cards}
+    with _cache_lock:
+        _archive_cache[cache_key] = result
+    return result
 
 
 @router.get("/detail")
 def card_detail(name: str, user: str = DEFAULT_USER):
-    """Return full detail for a single card including price history and raw sales."""
+    """Return full detail for a single card including price history and raw sales.
+
+    Cached per (user, data version, card) — reopening a card skips the price
+    history and card_results queries and the sales reshaping.
+    """
     card_name = name
+    cache_key = (user, get_data_version(user), card_name)
+    with _cache_lock:
+        cached = _detail_cache.get(cache_key)
+    if cached:
+        return cached
+
     df = load_data(user)
 
-    match = df[df["Card Name"] == card_name]
-    if match.empty:
+    i = find_card(df, user, card_name)
+    if i is None:
         raise HTTPException(status_code=404, detail="Card not found")
 
-    card = _normalise_row(match.iloc[0].fillna("").to_dict())
+    card = _normalise_row(df.loc[i].fillna("").to_dict())
 
     # Price history — deduplicated by date (keep latest value per date)
     entries = load_price_history(user, card_name)
@@ -184,7 +251,7 @@ def card_detail(name: str, user: str = DEFAULT_USER):
         for s in (card_result.get("raw_sales") or [])
     ]
 
-    return {
+    result = {
         "card":           card,
         "price_history":  price_history,
         "raw_sales":      raw_sales,
@@ -195,6 +262,9 @@ def card_detail(name: str, user: str = DEFAULT_USER):
         "is_estimated":   is_estimated,
         "price_source":   price_source,
     }
+    with _cache_lock:
+        _detail_cache[cache_key] = result
+    return result
 
 
 # ── Write endpoints ───────────────────────────────────────────────────────────
@@ -202,9 +272,7 @@ def card_detail(name: str, user: str = DEFAULT_USER):
 @router.post("")
 def add_card(body: CardCreate, user: str = DEFAULT_USER):
     """Add a new card to the collection."""
-    df = load_data(user)
-
-    if body.card_name in df["Card Name"].values:
+    if body.card_name in card_index(user):
         raise HTTPException(status_code=409, detail="Card already exists")
 
     new_row = pd.DataFrame([{
@@ -220,8 +288,8 @@ def add_card(body: CardCreate, user: str = DEFAULT_USER):
         "Max":          0,
         "Num Sales":    0,
     }])
-    df = pd.concat([df, new_row], ignore_index=True)
-    save_data(df, user)
+    # save_data upserts — persist just the new card, not the whole collection
+    save_data(new_row, user)
     return {"status": "ok", "card_name": body.card_name}
 
 
@@ -231,17 +299,24 @@ def update_card(name: str, body: CardUpdate, user: str = DEFAULT_USER):
     card_name = name
     df = load_data(user)
 
-    match = df[df["Card Name"] == card_name]
-    if match.empty:
+    i = find_card(df, user, card_name)
+    if i is None:
         raise HTTPException(status_code=404, detail="Card not found")
 
-    i = match.index[0]
-    if body.fair_value    is not None: df.at[i, "Fair Value"]    = body.fair_value
-    if body.cost_basis    is not None: df.at[i, "Cost Basis"]    = body.cost_basis
-    if body.purchase_date is not None: df.at[i, "Purchase Date"] = body.purchase_date
-    if body.tags          is not None: df.at[i, "Tags"]          = body.tags
-
-    save_data(df, user)
+    # Only fields that were sent and actually differ from the stored value
+    updates = {
+        col: val for col, val in (
+            ("Fair Value",    body.fair_value),
+            ("Cost Basis",    body.cost_basis),
+            ("Purchase Date", body.purchase_date),
+            ("Tags",          body.tags),
+        ) if val is not None and df.at[i, col] != val
+    }
+    if updates:
+        # One row-level assignment instead of a scalar write per field, and
+        # upsert just this row rather than the whole collection
+        df.loc[i, list(updates)] = list(updates.values())
+        save_data(df.loc[[i]], user)
     return {"status": "ok"}
 
 
@@ -249,12 +324,10 @@ def update_card(name: str, body: CardUpdate, user: str = DEFAULT_USER):
 def archive_card_endpoint(name: str, user: str = DEFAULT_USER):
     """Archive (soft-delete) a card, moving it out of the active collection."""
     card_name = name
-    df = load_data(user)
-
-    if df[df["Card Name"] == card_name].empty:
+    if card_name not in card_index(user):
         raise HTTPException(status_code=404, detail="Card not found")
 
-    archive_card(df, user, card_name)
+    archive_card(load_data(user), user, card_name)
     return {"status": "archived"}
 
 
@@ -262,56 +335,64 @@ def archive_card_endpoint(name: str, user: str = DEFAULT_USER):
 def restore_card_endpoint(name: str, user: str = DEFAULT_USER):
     """Restore a previously archived card back into the active collection."""
     card_name = name
-    card_data = restore_card(user, card_name)
-    if not card_data:
+    # restore_card clears the archived flag in place, so the row is already
+    # back in the active collection — no reload / re-save needed
+    if not restore_card(user, card_name):
         raise HTTPException(status_code=404, detail="Card not found in archive")
-
-    # Convert "$X.XX" money strings back to floats
-    for col in MONEY_COLS:
-        if col in card_data:
-            val = str(card_data[col]).replace("$", "").replace(",", "").strip()
-            try:
-                card_data[col] = float(val)
-            except ValueError:
-                card_data[col] = 0.0
-    card_data.pop("Archived Date", None)
-
-    df = load_data(user)
-    df = pd.concat([df, pd.DataFrame([card_data])], ignore_index=True)
-    save_data(df, user)
     return {"status": "restored", "card_name": card_name}
 
 
 # ── Scrape endpoint ───────────────────────────────────────────────────────────
 
+_SCRAPE_COLS = [
+    "Fair Value", "Trend", "Median (All)", "Min", "Max", "Num Sales", "Top 3 Prices",
+]
+
+
+def _forget_scrape(card_name: str, user: str):
+    """Drop a card from ``_recent_scrapes`` so the next Rescrape click runs."""
+    with _scrape_lock:
+        _recent_scrapes.pop((user, card_name), None)
+
+
 def _do_scrape(card_name: str, user: str):
-    """Background task: scrape eBay sales for one card and persist updated stats."""
+    """Background task: scrape eBay sales for one card and persist updated stats.
+
+    When the scrape finds no sales, fails, or the card has since been removed,
+    the card is dropped from ``_recent_scrapes`` so a retry isn't held off for
+    ``SCRAPE_TTL``.
+    """
     try:
         result = scrape_single_card(card_name, user)
         if not result:
+            _forget_scrape(card_name, user)
             return
         stats = result
         df = load_data(user)
-        idx = df[df["Card Name"] == card_name].index
-        if len(idx) == 0:
+        i = find_card(df, user, card_name)
+        if i is None:
+            _forget_scrape(card_name, user)
             return
-        i = idx[0]
         if stats.get("num_sales", 0) > 0:
-            df.at[i, "Fair Value"]   = stats.get("fair_price", 0)
-            df.at[i, "Trend"]        = stats.get("trend", "")
-            df.at[i, "Median (All)"] = stats.get("median_all", 0)
-            df.at[i, "Min"]          = stats.get("min", 0)
-            df.at[i, "Max"]          = stats.get("max", 0)
-            df.at[i, "Num Sales"]    = stats.get("num_sales", 0)
-            df.at[i, "Top 3 Prices"] = " | ".join(stats.get("top_3_prices", []))
+            df.loc[i, _SCRAPE_COLS] = [
+                stats.get("fair_price", 0),
+                normalize_trend(stats.get("trend")),
+                stats.get("median_all", 0),
+                stats.get("min", 0),
+                stats.get("max", 0),
+                stats.get("num_sales", 0),
+                " | ".join(stats.get("top_3_prices", [])),
+            ]
             append_price_history(
                 user, card_name,
                 stats.get("fair_price", 0),
                 stats.get("num_sales", 0),
             )
-        save_data(df, user)
+            # Only this card changed — upsert its row, not the whole ledger
+            save_data(df.loc[[i]], user)
         print(f"[scrape] Done: {card_name} → ${stats.get('fair_price', 0):.2f}")
     except Exception as e:
+        _forget_scrape(card_name, user)
         print(f"[scrape] Error for {card_name}: {e}")
 
 
@@ -333,9 +414,8 @@ def fetch_image(name: str, user: str = DEFAULT_USER):
     """Fetch and cache front and back card images from eBay listing URLs."""
     card_result = load_card_results(user, name)
     if not card_result and not card_result.get("raw_sales"):
-        # Try loading df to confirm card exists
-        df = load_data(user)
-        if df[df["Card Name"] == name].empty:
+        # Confirm the card exists
+        if name not in card_index(user):
             raise HTTPException(status_code=404, detail="Card not found in results")
 
     existing_front = card_result.get("image_url")
@@ -459,6 +539,25 @@ def fetch_image(name: str, user: str = DEFAULT_USER):
     return {"image_url": image_url, "image_url_back": image_url_back}
 
 
+def _read_import_csv(content: bytes) -> pd.DataFrame:
+    """Parse an uploaded CSV, preferring the multi-threaded pyarrow engine.
+
+    Every column is read as strings with empty fields as NaN, whichever engine
+    runs — without ``dtype=str`` pyarrow would infer dates and numbers the C
+    parser leaves as text. Falls back to pandas' C parser when pyarrow is not
+    installed or rejects the file as malformed (it is stricter about ragged
+    rows), so the error surfaced to the user comes from the same parser as
+    before.
+    """
+    if HAS_PYARROW:
+        try:
+            return pd.read_csv(io.BytesIO(content), engine="pyarrow", dtype=str)
+        except (ArrowInvalid, pd.errors.ParserError):
+            # pandas re-raises ArrowInvalid as ParserError; older versions don't
+            pass
+    return pd.read_csv(io.StringIO(content.decode("utf-8")), dtype=str)
+
+
 @router.post("/bulk-import")
 async def bulk_import(file: UploadFile = File(...), user: str = DEFAULT_USER):
     """Import multiple cards from an uploaded CSV file."""
@@ -466,7 +565,7 @@ async def bulk_import(file: UploadFile = File(...), user: str = DEFAULT_USER):
 
     content = await file.read()
     try:
-        import_df = pd.read_csv(io.StringIO(content.decode("utf-8")))
+        import_df = _read_import_csv(content)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid CSV: {e}")
 
@@ -479,18 +578,25 @@ async def bulk_import(file: UploadFile = File(...), user: str = DEFAULT_USER):
     if "Card Name" not in import_df.columns:
         raise HTTPException(status_code=400, detail="CSV must have a 'Card Name' column")
 
-    added, skipped = [], []
-    for _, row in import_df.iterrows():
+    # Parse money columns once, column-wise, rather than per row
+    fair_values = _money_column(import_df, "Fair Value", "fair_value")
+    cost_bases  = _money_column(import_df, "Cost Basis", "cost_basis")
+
+    added, skipped, new_rows = [], [], []
+    # Hash-set membership instead of scanning the Card Name column per row
+    existing = set(df["Card Name"])
+    for i, row in zip(import_df.index, import_df.to_dict(orient="records")):
         name = str(row.get("Card Name", "")).strip()
         if not name or name.lower() == "nan":
             continue
-        if name in df["Card Name"].values:
+        if name in existing:
             skipped.append(name)
             continue
+        existing.add(name)
         new_row = {
             "Card Name":    name,
-            "Fair Value":   _safe_float(row.get("Fair Value") or row.get("fair_value")),
-            "Cost Basis":   _safe_float(row.get("Cost Basis") or row.get("cost_basis")),
+            "Fair Value":   fair_values.at[i],
+            "Cost Basis":   cost_bases.at[i],
             "Purchase Date": str(row.get("Purchase Date") or row.get("purchase_date") or ""),
             "Tags":          str(row.get("Tags") or row.get("tags") or ""),
             "Trend":         "",
@@ -500,27 +606,58 @@ async def bulk_import(file: UploadFile = File(...), user: str = DEFAULT_USER):
             "Max":           0,
             "Num Sales":     0,
         }
-        df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
+        new_rows.append(new_row)
         added.append(name)
 
-    if added:
-        save_data(df, user)
+    if new_rows:
+        # One frame for the whole import; save_data upserts, so only the new
+        # cards need writing
+        save_data(pd.DataFrame(new_rows), user)
     return {"added": len(added), "skipped": len(skipped), "cards": added}
 
 
-def _safe_float(val):
-    try:
-        return float(str(val).replace("$", "").replace(",", "").strip())
-    except (ValueError, TypeError):
-        return 0.0
+def _money_column(import_df: pd.DataFrame, *names: str) -> pd.Series:
+    """Parse a money column from an import file as floats.
+
+    Takes the first of ``names`` with a usable value on each row (so both
+    "Fair Value" and "fair_value" headers work). ``$``, ``,`` and whitespace
+    are stripped with one vectorised string replace per column — with the
+    pyarrow string dtype this runs in Arrow's native kernels. Missing or
+    unparseable values become ``0.0``.
+    """
+    out = pd.Series(0.0, index=import_df.index)
+    for name in reversed(names):
+        if name not in import_df.columns:
+            continue
+        col = import_df[name]
+        if not pd.api.types.is_numeric_dtype(col):
+            col = pd.to_numeric(
+                col.astype(str).str.replace(r"[$,\s]", "", regex=True),
+                errors="coerce",
+            )
+        out = col.astype(float).fillna(out)
+    return out
 
 
 @router.post("/scrape")
-def scrape_card(name: str, background_tasks: BackgroundTasks, user: str = DEFAULT_USER):
-    """Trigger an asynchronous eBay re-scrape for a single card."""
+def scrape_card(
+    name: str,
+    background_tasks: BackgroundTasks,
+    user: str = DEFAULT_USER,
+    force: bool = False,
+):
+    """Trigger an asynchronous eBay re-scrape for a single card.
+
+    A card already scraped or queued within ``SCRAPE_TTL`` seconds is not
+    queued again (status ``"recent"``) unless ``force`` is set.
+    """
     card_name = name
-    df = load_data(user)
-    if df[df["Card Name"] == card_name].empty:
+    if card_name not in card_index(user):
         raise HTTPException(status_code=404, detail="Card not found")
+    key = (user, card_name)
+    with _scrape_lock:
+        if not force and key in _recent_scrapes:
+            return {"status": "recent", "card": card_name}
+        _recent_scrapes[key] = True
     background_tasks.add_task(_do_scrape, card_name, user)
     return {"status": "queued", "card": card_name}
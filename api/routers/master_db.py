@@ -2,6 +2,8 @@
 
 import datetime
 from typing import Optional
+
+import pandas as pd
 from fastapi import APIRouter, BackgroundTasks, HTTPException
 from pydantic import BaseModel
 
@@ -18,6 +20,10 @@ from dashboard_utils import (
 
 router = APIRouter()
 
+# Account whose card_results row records a master DB scrape's raw sales — the
+# master DB itself is shared, but scrape_single_card persists per user.
+DEFAULT_USER = "admin"
+
 
 def _num(r, col):
     """Extract a numeric value from a DataFrame row dict, returning None for blanks.
@@ -47,7 +53,8 @@ def list_young_guns(search: str = ""):
     Args:
         search: Optional free-text filter applied across PlayerName, Season,
                 Set, and Team columns (case-insensitive substring match).
-                Defaults to '' (no filter).
+                Each whitespace-separated term must match at least one of
+                them. Defaults to '' (no filter).
 
     Returns:
         Dict with keys 'cards' (list of card dicts with raw, PSA, and BGS
@@ -56,18 +63,30 @@ def list_young_guns(search: str = ""):
         strings).
     """
     df = load_master_db()
-    if search:
-        s = search.lower()
-        mask = (
-            df["PlayerName"].str.lower().str.contains(s, na=False)
-            | df["Season"].astype(str).str.contains(s)
-            | df["Set"].str.lower().str.contains(s, na=False)
-            | df["Team"].str.lower().str.contains(s, na=False)
-        )
+
+    # Unique season + team lists for filter dropdowns — taken from the full
+    # table, before searching, so they're independent of the search string
+    seasons = sorted(df["Season"].dropna().astype(str).unique().tolist(), reverse=True)
+    teams   = sorted(df["Team"].dropna().unique().tolist())
+
+    terms = search.split()
+    if terms:
+        # Literal, case-insensitive substring match — no per-column lowercased
+        # copies, and user input is never compiled as a regex. Every term must
+        # match some field, so "bedard 2023" narrows rather than widens.
+        seasons_col = df["Season"].astype(str)
+        mask = pd.Series(True, index=df.index)
+        for t in terms:
+            mask &= (
+                df["PlayerName"].str.contains(t, case=False, regex=False, na=False)
+                | seasons_col.str.contains(t, case=False, regex=False)
+                | df["Set"].str.contains(t, case=False, regex=False, na=False)
+                | df["Team"].str.contains(t, case=False, regex=False, na=False)
+            )
         df = df[mask]
 
     cards = []
-    for _, r in df.fillna("").iterrows():
+    for r in df.fillna("").to_dict(orient="records"):
         cards.append({
             "player":       r.get("PlayerName", ""),
             "season":       r.get("Season", ""),
@@ -102,10 +121,6 @@ def list_young_guns(search: str = ""):
             "card_name":    r.get("CardName", ""),
         })
 
-    # Unique season + team lists for filter dropdowns
-    seasons = sorted(df["Season"].dropna().astype(str).unique().tolist(), reverse=True)
-    teams   = sorted(df["Team"].dropna().unique().tolist())
-
     return {"cards": cards, "seasons": seasons, "teams": teams}
 
 
@@ -182,7 +197,7 @@ def nhl_stats():
     players_data = stats_data.get("players", {})
 
     result = []
-    for _, r in df.fillna("").iterrows():
+    for r in df.fillna("").to_dict(orient="records"):
         player_name = r.get("PlayerName", "")
         ps = players_data.get(player_name, {})
         cs = ps.get("current_season", {})
@@ -273,11 +288,11 @@ def grading_lookup(player_name: str):
     df = load_master_db()
     matches = df[df["PlayerName"].str.lower() == player_name.lower().strip()]
     if matches.empty:
-        matches = df[df["PlayerName"].str.lower().str.contains(player_name.lower().strip(), na=False)]
+        matches = df[df["PlayerName"].str.contains(player_name.strip(), case=False, regex=False, na=False)]
 
     if not matches.empty:
         cards = []
-        for _, r in matches.fillna("").iterrows():
+        for r in matches.fillna("").to_dict(orient="records"):
             raw  = _num(r, "FairValue")
             p10  = _num(r, "PSA10_Value")
             p9   = _num(r, "PSA9_Value")
@@ -419,7 +434,10 @@ def yg_price_history_by_name(name: str):
     return {"card": name, "history": entries}
 
 
-def _do_yg_scrape(player: str, season: str):
+_YG_SCRAPE_COLS = ["FairValue", "Trend", "Min", "Max", "NumSales", "LastScraped"]
+
+
+def _do_yg_scrape(player: str, season: str, user: str = DEFAULT_USER):
     """Background task: scrape eBay sales for one YG card and update the master DB.
 
     Looks up the card's full name from the master DB, calls scrape_single_card,
@@ -431,6 +449,7 @@ def _do_yg_scrape(player: str, season: str):
         player: PlayerName string to identify the row in the master DB.
         season: Season string (e.g. '2020-21') to uniquely identify the row
                 alongside the player name.
+        user: Username whose card_results row receives the raw sales.
     """
     try:
         df = load_master_db()
@@ -438,24 +457,26 @@ def _do_yg_scrape(player: str, season: str):
         if not mask.any():
             return
         card_name = str(df.loc[mask, "CardName"].iloc[0])
-        result = scrape_single_card(card_name)
-        if not result:
+        stats = scrape_single_card(card_name, user)
+        if not stats:
             return
-        stats = result.get("stats", {})
         if stats.get("num_sales", 0) > 0:
-            df.loc[mask, "FairValue"]   = stats.get("fair_price", 0)
-            df.loc[mask, "Trend"]       = stats.get("trend", "")
-            df.loc[mask, "Min"]         = stats.get("min", 0)
-            df.loc[mask, "Max"]         = stats.get("max", 0)
-            df.loc[mask, "NumSales"]    = stats.get("num_sales", 0)
-            df.loc[mask, "LastScraped"] = datetime.date.today().isoformat()
+            df.loc[mask, _YG_SCRAPE_COLS] = [
+                stats.get("fair_price", 0),
+                stats.get("trend", ""),
+                stats.get("min", 0),
+                stats.get("max", 0),
+                stats.get("num_sales", 0),
+                datetime.date.today().isoformat(),
+            ]
             save_master_db(df)
     except Exception as e:
         print(f"[yg_scrape] Error for {player} {season}: {e}")
 
 
 @router.post("/scrape")
-def scrape_yg_card(player: str, season: str, background_tasks: BackgroundTasks):
+def scrape_yg_card(player: str, season: str, background_tasks: BackgroundTasks,
+                   user: str = DEFAULT_USER):
     """Trigger an asynchronous eBay re-scrape for a single YG card.
 
     Validates the card exists in the master DB, then schedules _do_yg_scrape
@@ -465,6 +486,7 @@ def scrape_yg_card(player: str, season: str, background_tasks: BackgroundTasks):
         player: PlayerName query param to identify the YG card row.
         season: Season query param (e.g. '2020-21') to uniquely identify the row.
         background_tasks: FastAPI BackgroundTasks instance for deferred execution.
+        user: Username the scrape's raw sales are stored under (default "admin").
 
     Returns:
         Dict with keys 'status' ('queued') and 'card' (the full card name string).
@@ -479,7 +501,7 @@ def scrape_yg_card(player: str, season: str, background_tasks: BackgroundTasks):
     if not mask.any():
         raise HTTPException(status_code=404, detail="Card not found")
     card_name = str(df.loc[mask, "CardName"].iloc[0])
-    background_tasks.add_task(_do_yg_scrape, player, season)
+    background_tasks.add_task(_do_yg_scrape, player, season, user)
     return {"status": "queued", "card": card_name}
 
 
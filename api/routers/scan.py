@@ -1,17 +1,66 @@
 """Card scanning endpoint — uses Claude Vision to identify cards from images."""
 
 import os
+import asyncio
 import base64
-import json
-import re
-from typing import Optional
+import hashlib
+import threading
+from typing import List, Optional
+
+from cachetools import TTLCache
 
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from dashboard_utils import parse_json_object, prepare_scan_image
 
 router = APIRouter()
 
 ALLOWED_TYPES = {"image/jpeg", "image/jpg", "image/png", "image/webp"}
 MAX_SIZE_BYTES = 20 * 1024 * 1024  # 20 MB
+MAX_BATCH_FILES = 30
+BATCH_CONCURRENCY = 5  # in-flight Claude calls per batch request
+
+# Prepared image sources keyed by a hash of the raw upload — re-analysing the
+# same photo skips the decode/resize/JPEG/base64 pipeline. Entries are the
+# downscaled payloads (well under 1 MB each), so the cache stays small.
+_source_cache: TTLCache = TTLCache(maxsize=32, ttl=600)   # 10 min
+_source_cache_lock = threading.Lock()
+
+# Static instruction block appended after the card images — built once at
+# import rather than on every request.
+_SCAN_PROMPT = (
+    "Analyze this hockey/sports card and extract the following details.\n"
+    "Look at BOTH the front and back of the card carefully.\n\n"
+    "The back typically has: card number, set name, year, manufacturer, serial number.\n"
+    "The front typically has: player name, team, photo, parallel color/foil name.\n\n"
+    "Return ONLY valid JSON with these exact keys:\n"
+    "{\n"
+    '    "player_name": "Full player name as printed on the card",\n'
+    '    "card_number": "Card number only, no # symbol (e.g. 201, RC-15)",\n'
+    '    "brand": "Base set brand WITHOUT subset, use short common names '
+    '(e.g. \\"Upper Deck Series 1\\", \\"O-Pee-Chee Platinum\\", \\"Topps Chrome\\", '
+    '\\"SP Authentic\\", \\"Parkhurst\\")",\n'
+    '    "subset": "Named product line within the set if any '
+    '(e.g. \\"Young Guns\\", \\"Marquee Rookies\\", \\"Future Watch\\"). '
+    'Empty string for true base set cards.",\n'
+    '    "parallel": "Parallel or foil variant name if any '
+    '(e.g. \\"Red Prism\\", \\"Gold\\", \\"Rainbow Foil\\", \\"Arctic Freeze\\"). '
+    'Empty string if this is the base (non-parallel) version.",\n'
+    '    "year": "Card year or season (e.g. \\"2023-24\\" or \\"2015\\")",\n'
+    '    "serial_number": "Print run if the card is serial-numbered '
+    '(e.g. \\"70/99\\", \\"1/250\\", \\"5/10\\"). '
+    'Empty string if not numbered. Check back of card carefully.",\n'
+    '    "grade": "Grade if card is in a graded slab '
+    '(e.g. \\"PSA 10\\", \\"BGS 9.5\\", \\"SGC 9\\"). Empty string if raw/ungraded.",\n'
+    '    "confidence": "high, medium, or low",\n'
+    '    "is_sports_card": true,\n'
+    '    "validation_reason": "Explain why this is or isn\'t a valid sports card"\n'
+    "}\n\n"
+    "Be precise. If the image is not a sports card, set \"is_sports_card\" to false "
+    "and explain why in \"validation_reason\".\n"
+    "If you can't determine a field, use your best guess based on visible text, logos, and card design."
+)
 
 
 def _detect_media_type(image_bytes: bytes) -> str:
@@ -35,37 +84,42 @@ def _detect_media_type(image_bytes: bytes) -> str:
     return "image/jpeg"
 
 
-@router.post("/analyze")
-async def analyze_card(
-    front: UploadFile = File(...),
-    back:  Optional[UploadFile] = File(default=None),
-):
-    """Identify a sports card from uploaded images using Claude Vision.
+def _image_source(data: bytes) -> dict:
+    """Build an Anthropic base64 image source from raw upload bytes.
 
-    Accepts a mandatory front image and an optional back image (multipart
-    form-data). Both images are base64-encoded and sent to the Claude
-    claude-sonnet-4-6 model with a structured prompt requesting JSON output.
-    The raw model response is parsed and validated; on parse failure the
-    raw text is returned with 'parse_error' set to True.
+    The image is first downscaled/recompressed via ``prepare_scan_image`` so
+    large phone photos don't dominate upload time and token cost. Results are
+    cached by content hash, so scanning the same photo again is free.
+    """
+    key = hashlib.blake2b(data, digest_size=16).digest()
+    with _source_cache_lock:
+        cached = _source_cache.get(key)
+    if cached:
+        return cached
 
-    Each image must be JPEG, PNG, or WebP and no larger than 20 MB.
+    data = prepare_scan_image(data)
+    source = {
+        "type": "base64",
+        "media_type": _detect_media_type(data),
+        "data": base64.standard_b64encode(data).decode("utf-8"),
+    }
+    with _source_cache_lock:
+        _source_cache[key] = source
+    return source
 
-    Args:
-        front: Mandatory front-face image of the card (JPEG/PNG/WebP, max 20 MB).
-        back: Optional back-face image of the card (JPEG/PNG/WebP, max 20 MB).
 
-    Returns:
-        Dict with keys: 'player_name', 'card_number', 'brand', 'subset',
-        'parallel', 'serial_number', 'year', 'grade', 'confidence'
-        (high|medium|low), 'is_sports_card' (bool), 'validation_reason',
-        'raw_text' (raw model output), and 'parse_error' (bool).
+def _empty_result(raw_text: str) -> dict:
+    """Return the fallback response used when the model output can't be parsed."""
+    return {
+        "player_name": "", "card_number": "", "brand": "", "subset": "",
+        "parallel": "", "serial_number": "", "year": "", "grade": "",
+        "confidence": "low", "is_sports_card": True, "validation_reason": "",
+        "raw_text": raw_text, "parse_error": True,
+    }
 
-    Raises:
-        HTTPException: 400 if the front image type is not in ALLOWED_TYPES or
-                       either image exceeds MAX_SIZE_BYTES.
-        HTTPException: 503 if the anthropic package is not installed or
-                       ANTHROPIC_API_KEY is not set in the environment.
-    """
+
+def _get_client():
+    """Return an Anthropic client, or raise 503 if the SDK or API key is missing."""
     try:
         import anthropic
     except ImportError:
@@ -80,70 +134,58 @@ async def analyze_card(
             status_code=503,
             detail="ANTHROPIC_API_KEY environment variable not set"
         )
+    return anthropic.Anthropic(api_key=api_key)
+
+
+def _check_size(upload: UploadFile, label: str) -> None:
+    """Reject an upload from its declared size, before its body is read."""
+    if upload.size is not None and upload.size > MAX_SIZE_BYTES:
+        raise HTTPException(status_code=400, detail=f"{label} image too large (max 20MB)")
+
 
-    if front.content_type not in ALLOWED_TYPES:
-        raise HTTPException(status_code=400, detail=f"Unsupported file type: {front.content_type}")
+def _check_image(upload: UploadFile, label: str) -> None:
+    """Validate an upload's content type and declared size without reading it."""
+    if upload.content_type not in ALLOWED_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported file type: {upload.content_type}")
+    _check_size(upload, label)
 
-    front_data = await front.read()
-    if len(front_data) > MAX_SIZE_BYTES:
-        raise HTTPException(status_code=400, detail="Front image too large (max 20MB)")
 
-    front_b64  = base64.standard_b64encode(front_data).decode("utf-8")
-    front_type = _detect_media_type(front_data)
+async def _read_image(upload: UploadFile, label: str) -> bytes:
+    """Read an uploaded image, enforcing the allowed types and size limit."""
+    _check_image(upload, label)
+    data = await upload.read()
+    if len(data) > MAX_SIZE_BYTES:
+        raise HTTPException(status_code=400, detail=f"{label} image too large (max 20MB)")
+    return data
+
+
+async def _analyze(client, front_data: bytes, back_data: Optional[bytes] = None) -> dict:
+    """Run one front/back image pair through Claude Vision and parse the result."""
+    # Downscaling and encoding multi-MB images is CPU-bound — do both sides in
+    # the threadpool concurrently rather than stalling the event loop
+    if back_data:
+        front_src, back_src = await asyncio.gather(
+            run_in_threadpool(_image_source, front_data),
+            run_in_threadpool(_image_source, back_data),
+        )
+    else:
+        front_src = await run_in_threadpool(_image_source, front_data)
 
     # Build content — label front and back clearly so the model uses both
     content = [
         {"type": "text", "text": "FRONT OF CARD:"},
-        {"type": "image", "source": {"type": "base64", "media_type": front_type, "data": front_b64}},
+        {"type": "image", "source": front_src},
     ]
 
-    if back:
-        back_data = await back.read()
-        if len(back_data) > MAX_SIZE_BYTES:
-            raise HTTPException(status_code=400, detail="Back image too large (max 20MB)")
-        back_b64  = base64.standard_b64encode(back_data).decode("utf-8")
-        back_type = _detect_media_type(back_data)
+    if back_data:
         content.append({"type": "text", "text": "BACK OF CARD:"})
-        content.append({"type": "image", "source": {"type": "base64", "media_type": back_type, "data": back_b64}})
-
-    content.append({
-        "type": "text",
-        "text": (
-            "Analyze this hockey/sports card and extract the following details.\n"
-            "Look at BOTH the front and back of the card carefully.\n\n"
-            "The back typically has: card number, set name, year, manufacturer, serial number.\n"
-            "The front typically has: player name, team, photo, parallel color/foil name.\n\n"
-            "Return ONLY valid JSON with these exact keys:\n"
-            "{\n"
-            '    "player_name": "Full player name as printed on the card",\n'
-            '    "card_number": "Card number only, no # symbol (e.g. 201, RC-15)",\n'
-            '    "brand": "Base set brand WITHOUT subset, use short common names '
-            '(e.g. \\"Upper Deck Series 1\\", \\"O-Pee-Chee Platinum\\", \\"Topps Chrome\\", '
-            '\\"SP Authentic\\", \\"Parkhurst\\")",\n'
-            '    "subset": "Named product line within the set if any '
-            '(e.g. \\"Young Guns\\", \\"Marquee Rookies\\", \\"Future Watch\\"). '
-            'Empty string for true base set cards.",\n'
-            '    "parallel": "Parallel or foil variant name if any '
-            '(e.g. \\"Red Prism\\", \\"Gold\\", \\"Rainbow Foil\\", \\"Arctic Freeze\\"). '
-            'Empty string if this is the base (non-parallel) version.",\n'
-            '    "year": "Card year or season (e.g. \\"2023-24\\" or \\"2015\\")",\n'
-            '    "serial_number": "Print run if the card is serial-numbered '
-            '(e.g. \\"70/99\\", \\"1/250\\", \\"5/10\\"). '
-            'Empty string if not numbered. Check back of card carefully.",\n'
-            '    "grade": "Grade if card is in a graded slab '
-            '(e.g. \\"PSA 10\\", \\"BGS 9.5\\", \\"SGC 9\\"). Empty string if raw/ungraded.",\n'
-            '    "confidence": "high, medium, or low",\n'
-            '    "is_sports_card": true,\n'
-            '    "validation_reason": "Explain why this is or isn\'t a valid sports card"\n'
-            "}\n\n"
-            "Be precise. If the image is not a sports card, set \"is_sports_card\" to false "
-            "and explain why in \"validation_reason\".\n"
-            "If you can't determine a field, use your best guess based on visible text, logos, and card design."
-        ),
-    })
-
-    client  = anthropic.Anthropic(api_key=api_key)
-    message = client.messages.create(
+        content.append({"type": "image", "source": back_src})
+
+    content.append({"type": "text", "text": _SCAN_PROMPT})
+
+    # The SDK call is synchronous — keep it off the event loop as well
+    message = await run_in_threadpool(
+        client.messages.create,
         model="claude-sonnet-4-6",
         max_tokens=768,
         messages=[{"role": "user", "content": content}],
@@ -151,21 +193,9 @@ async def analyze_card(
 
     raw_text = message.content[0].text.strip()
 
-    _EMPTY = {
-        "player_name": "", "card_number": "", "brand": "", "subset": "",
-        "parallel": "", "serial_number": "", "year": "", "grade": "",
-        "confidence": "low", "is_sports_card": True, "validation_reason": "",
-        "raw_text": raw_text, "parse_error": True,
-    }
-
-    json_match = re.search(r'\{[^{}]*\}', raw_text, re.DOTALL)
-    if not json_match:
-        return _EMPTY
-
-    try:
-        result = json.loads(json_match.group())
-    except json.JSONDecodeError:
-        return _EMPTY
+    result = parse_json_object(raw_text)
+    if result is None:
+        return _empty_result(raw_text)
 
     return {
         "player_name":       result.get("player_name", ""),
@@ -182,3 +212,101 @@ async def analyze_card(
         "raw_text":          raw_text,
         "parse_error":       False,
     }
+
+
+@router.post("/analyze")
+async def analyze_card(
+    front: UploadFile = File(...),
+    back:  Optional[UploadFile] = File(default=None),
+):
+    """Identify a sports card from uploaded images using Claude Vision.
+
+    Accepts a mandatory front image and an optional back image (multipart
+    form-data). Both images are base64-encoded and sent to the Claude
+    claude-sonnet-4-6 model with a structured prompt requesting JSON output.
+    The raw model response is parsed and validated; on parse failure the
+    raw text is returned with 'parse_error' set to True.
+
+    Each image must be JPEG, PNG, or WebP and no larger than 20 MB.
+
+    Args:
+        front: Mandatory front-face image of the card (JPEG/PNG/WebP, max 20 MB).
+        back: Optional back-face image of the card (JPEG/PNG/WebP, max 20 MB).
+
+    Returns:
+        Dict with keys: 'player_name', 'card_number', 'brand', 'subset',
+        'parallel', 'serial_number', 'year', 'grade', 'confidence'
+        (high|medium|low), 'is_sports_card' (bool), 'validation_reason',
+        'raw_text' (raw model output), and 'parse_error' (bool).
+
+    Raises:
+        HTTPException: 400 if the front image type is not in ALLOWED_TYPES or
+                       either image exceeds MAX_SIZE_BYTES.
+        HTTPException: 503 if the anthropic package is not installed or
+                       ANTHROPIC_API_KEY is not set in the environment.
+    """
+    client = _get_client()
+
+    front_data = await _read_image(front, "Front")
+
+    back_data = None
+    if back:
+        _check_size(back, "Back")
+        back_data = await back.read()
+        if len(back_data) > MAX_SIZE_BYTES:
+            raise HTTPException(status_code=400, detail="Back image too large (max 20MB)")
+
+    return await _analyze(client, front_data, back_data)
+
+
+@router.post("/analyze-batch")
+async def analyze_card_batch(files: List[UploadFile] = File(...)):
+    """Identify a stack of cards, one front image per card, concurrently.
+
+    Each image is analysed exactly as ``/analyze`` would with no back image.
+    At most ``BATCH_CONCURRENCY`` Claude calls are in flight at once, so wall
+    time is roughly ``ceil(N / BATCH_CONCURRENCY)`` round-trips instead of N.
+    A failure on one card does not fail the batch — that entry comes back as
+    a parse-error result with an 'error' message.
+
+    Args:
+        files: Front-face images (JPEG/PNG/WebP, max 20 MB each), at most
+               ``MAX_BATCH_FILES``.
+
+    Returns:
+        Dict with 'results': a list of per-card dicts in upload order, each
+        shaped like the ``/analyze`` response plus the source 'filename'.
+
+    Raises:
+        HTTPException: 400 if there are too many files, or any file has an
+                       unsupported type or exceeds MAX_SIZE_BYTES.
+        HTTPException: 503 if the anthropic package is not installed or
+                       ANTHROPIC_API_KEY is not set in the environment.
+    """
+    if len(files) > MAX_BATCH_FILES:
+        raise HTTPException(status_code=400, detail=f"Too many files (max {MAX_BATCH_FILES})")
+
+    client = _get_client()
+
+    # Validate everything up front so a bad file rejects the batch before any
+    # API spend — from the declared type and size only, without reading bodies
+    for f in files:
+        _check_image(f, f.filename or "Front")
+
+    sem = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def one(upload: UploadFile) -> dict:
+        # Read inside the semaphore so at most BATCH_CONCURRENCY raw uploads
+        # are held in memory at once, not the whole batch
+        async with sem:
+            data = await _read_image(upload, upload.filename or "Front")
+            return await _analyze(client, data)
+
+    outcomes = await asyncio.gather(*(one(f) for f in files), return_exceptions=True)
+
+    results = []
+    for f, outcome in zip(files, outcomes):
+        if isinstance(outcome, Exception):
+            outcome = {**_empty_result(""), "error": str(outcome)}
+        results.append({**outcome, "filename": f.filename})
+    return {"results": results}
@@ -1,15 +1,22 @@
+import io
 import os
+import atexit
 import base64
+import functools
 import json
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import urllib.parse
 import pandas as pd
 import yaml
+from cachetools import TTLCache
 try:
     import bcrypt
 except ImportError:
     bcrypt = None
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -29,6 +36,18 @@ try:
 except ImportError:
     HAS_ANTHROPIC = False
 
+try:
+    from PIL import Image, ImageOps
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+try:
+    import pyarrow  # noqa: F401 — enables the "string[pyarrow]" dtype
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
 from db import get_db
 from psycopg2.extras import RealDictCursor, execute_values
 
@@ -37,6 +56,15 @@ USERS_YAML = os.path.join(SCRIPT_DIR, "users.yaml")
 
 MONEY_COLS = ['Fair Value', 'Median (All)', 'Min', 'Max', 'Cost Basis']
 
+# Trend only ever takes a handful of values — held as a categorical so the
+# cached ledger stores int8 codes rather than one Python string per row.
+TREND_DTYPE = pd.CategoricalDtype(['up', 'down', 'stable', 'no data'])
+_TREND_ALIASES = {'insufficient data': 'no data', 'unknown': 'no data'}
+
+# Longest edge sent to Claude Vision — larger images are downscaled server-side
+# anyway, so anything beyond this only adds upload time and payload size.
+SCAN_MAX_EDGE = 1568
+
 # ── User management ──────────────────────────────────────────────
 
 def load_users():
@@ -75,6 +103,94 @@ def verify_password(username, password):
         return False
 
 
+# Instruction block appended after the card images in ``analyze_card_images``.
+_ANALYZE_PROMPT = """Analyze this hockey/sports card and extract the following details.
+Look at BOTH the front and back of the card carefully.
+
+The back typically has: card number, set name, year, manufacturer info.
+The front typically has: player name, team, photo.
+
+Return ONLY valid JSON with these exact keys:
+{
+    "player_name": "Full player name",
+    "card_number": "Just the number (e.g. 201, not #201)",
+    "card_set": "Set name with subset (e.g. Upper Deck Series 1 Young Guns)",
+    "year": "Card year or season (e.g. 2023-24)",
+    "variant": "Parallel or variant name if any, empty string if base card",
+    "grade": "Grade if in a graded slab (e.g. PSA 10), empty string if raw",
+    "confidence": "high, medium, or low",
+    "is_sports_card": true,
+    "validation_reason": "Explain why this is or isn't a valid sports card"
+}
+
+Be precise. If the image is not a sports card, set "is_sports_card" to false and explain why in "validation_reason".
+If you can't determine a field, use your best guess based on card design, logos, and text visible."""
+
+
+def parse_json_object(text):
+    """Extract a JSON object from a model response.
+
+    The prompt asks for bare JSON, so the whole string is tried first; if that
+    fails (markdown fences, leading prose) the slice between the first ``{``
+    and the last ``}`` is parsed instead.  Both paths are linear and handle
+    nested objects.
+
+    Args:
+        text: Raw model response text.
+
+    Returns:
+        The decoded dict, or ``None`` when no JSON object can be parsed.
+    """
+    try:
+        obj = json.loads(text)
+        if isinstance(obj, dict):
+            return obj
+    except ValueError:
+        pass
+    start, end = text.find('{'), text.rfind('}')
+    if start == -1 or end < start:
+        return None
+    try:
+        obj = json.loads(text[start:end + 1])
+    except ValueError:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+def prepare_scan_image(image_bytes):
+    """Downscale and JPEG-recompress a card photo before sending it to Claude.
+
+    Phone photos are routinely 3-12 MB; shrinking the longest edge to
+    ``SCAN_MAX_EDGE`` and re-encoding as JPEG (quality 85) cuts the base64
+    payload by 5-20x with no loss of legible card text.  EXIF rotation is
+    applied so the model sees the card upright.
+
+    Args:
+        image_bytes: Raw uploaded image bytes (JPEG, PNG, or WebP).
+
+    Returns:
+        JPEG bytes of the prepared image, or the original bytes unchanged when
+        Pillow is unavailable, the image cannot be decoded, or it is already an
+        upright JPEG within the size limit.
+    """
+    if not HAS_PIL:
+        return image_bytes
+    try:
+        img = Image.open(io.BytesIO(image_bytes))
+        # Pass small JPEGs through untouched unless an EXIF Orientation tag
+        # (0x0112) says they still need rotating upright
+        if (img.format == 'JPEG' and max(img.size) <= SCAN_MAX_EDGE
+                and img.getexif().get(0x0112, 1) == 1):
+            return image_bytes
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((SCAN_MAX_EDGE, SCAN_MAX_EDGE), Image.LANCZOS)
+        buf = io.BytesIO()
+        img.convert('RGB').save(buf, 'JPEG', quality=85, optimize=True)
+        return buf.getvalue()
+    except Exception:
+        return image_bytes
+
+
 def analyze_card_images(front_image_bytes, back_image_bytes=None):
     """Use Claude Vision to extract structured card details from photo bytes.
 
@@ -127,6 +243,15 @@ def analyze_card_images(front_image_bytes, back_image_bytes=None):
 
     content = []
 
+    # Prepare both sides in parallel — Pillow releases the GIL while resizing
+    if back_image_bytes:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            front_image_bytes, back_image_bytes = pool.map(
+                prepare_scan_image, (front_image_bytes, back_image_bytes)
+            )
+    else:
+        front_image_bytes = prepare_scan_image(front_image_bytes)
+
     # Add front image
     front_b64 = base64.standard_b64encode(front_image_bytes).decode("utf-8")
     front_media = _detect_media_type(front_image_bytes)
@@ -146,30 +271,7 @@ def analyze_card_images(front_image_bytes, back_image_bytes=None):
             "source": {"type": "base64", "media_type": back_media, "data": back_b64}
         })
 
-    content.append({
-        "type": "text",
-        "text": """Analyze this hockey/sports card and extract the following details.
-Look at BOTH the front and back of the card carefully.
-
-The back typically has: card number, set name, year, manufacturer info.
-The front typically has: player name, team, photo.
-
-Return ONLY valid JSON with these exact keys:
-{
-    "player_name": "Full player name",
-    "card_number": "Just the number (e.g. 201, not #201)",
-    "card_set": "Set name with subset (e.g. Upper Deck Series 1 Young Guns)",
-    "year": "Card year or season (e.g. 2023-24)",
-    "variant": "Parallel or variant name if any, empty string if base card",
-    "grade": "Grade if in a graded slab (e.g. PSA 10), empty string if raw",
-    "confidence": "high, medium, or low",
-    "is_sports_card": true,
-    "validation_reason": "Explain why this is or isn't a valid sports card"
-}
-
-Be precise. If the image is not a sports card, set "is_sports_card" to false and explain why in "validation_reason".
-If you can't determine a field, use your best guess based on card design, logos, and text visible."""
-    })
+    content.append({"type": "text", "text": _ANALYZE_PROMPT})
 
     try:
         response = client.messages.create(
@@ -179,13 +281,10 @@ If you can't determine a field, use your best guess based on card design, logos,
         )
 
         response_text = response.content[0].text.strip()
-        # Extract JSON from response (handle markdown code blocks)
-        json_match = re.search(r'\{[^{}]*\}', response_text, re.DOTALL)
-        if json_match:
-            card_info = json.loads(json_match.group())
-            return card_info, None
-        else:
+        card_info = parse_json_object(response_text)
+        if card_info is None:
             return None, f"Could not parse response: {response_text[:200]}"
+        return card_info, None
     except Exception as e:
         return None, str(e)
 
@@ -259,6 +358,78 @@ def _filter_sales_by_variant(card_name, sales):
     return filtered
 
 
+# Patterns used by the single-card scrape path — compiled once at import
+# instead of on every eBay result row.
+_PRICE_RE         = re.compile(r'\$([\d,]+\.?\d*)')
+_SOLD_DATE_RE     = re.compile(r'Sold\s+(\w+\s+\d+,?\s*\d*)')
+_GRADE_BRACKET_RE = re.compile(r'\s*\[(?:PSA|BGS|CGC|SGC|CSG)\s+[\d.]+[^\]]*\]')
+_GRADE_INLINE_RE  = re.compile(r'\s+(?:PSA|BGS|CGC|SGC|CSG)\s+\d+(?:\.\d+)?\s*$', re.IGNORECASE)
+_PSA10_RE         = re.compile(r'\bPSA\s*10\b', re.IGNORECASE)
+
+# Pulls title/price/caption text plus candidate shipping lines for every
+# ``.s-card`` result in a single ``execute_script`` call.  Shipping candidates
+# mirror the old XPath ``.//*[contains(text(),"delivery") or contains(text(),"shipping")]``.
+_EBAY_ITEMS_JS = """
+const txt = (root, sel) => { const el = root.querySelector(sel); return el ? el.innerText : ''; };
+return Array.from(document.querySelectorAll('.s-card')).map(card => ({
+  title:   txt(card, '.s-card__title'),
+  price:   txt(card, '.s-card__price'),
+  caption: txt(card, '.s-card__caption'),
+  shipping: Array.from(card.querySelectorAll('*'))
+    .filter(el => Array.from(el.childNodes).some(n =>
+      n.nodeType === 3 && /delivery|shipping/.test(n.textContent)))
+    .map(el => el.innerText),
+}));
+"""
+
+
+# One headless Chrome is kept alive for the life of the process and reused
+# across single-card scrapes — launching Chrome costs 1-3 s per card.  Chrome
+# sessions are not thread-safe, so callers serialise on ``_driver_lock``.
+_driver = None
+_driver_lock = threading.Lock()
+# Upper bounds on a single page load / injected script so a hung eBay page
+# raises instead of holding ``_driver_lock`` forever.
+DRIVER_PAGE_LOAD_TIMEOUT = 30
+DRIVER_SCRIPT_TIMEOUT = 15
+
+
+def _quit_driver():
+    """Quit the shared scrape driver, if one is running."""
+    global _driver
+    if _driver is not None:
+        try:
+            _driver.quit()
+        except Exception:
+            pass
+        _driver = None
+
+
+atexit.register(_quit_driver)
+
+
+def _get_driver():
+    """Return the shared Chrome WebDriver, launching or relaunching as needed.
+
+    Cookies are cleared between scrapes so each search starts from a clean
+    session; a failure doing so means the browser has died and is replaced.
+
+    Returns:
+        A live selenium.webdriver.Chrome instance.
+    """
+    global _driver
+    if _driver is not None:
+        try:
+            _driver.delete_all_cookies()
+            return _driver
+        except Exception:
+            _quit_driver()
+    _driver = create_driver()
+    _driver.set_page_load_timeout(DRIVER_PAGE_LOAD_TIMEOUT)
+    _driver.set_script_timeout(DRIVER_SCRIPT_TIMEOUT)
+    return _driver
+
+
 def _strip_grade_from_name(card_name):
     """Remove a grading-company label from a card name to obtain its raw equivalent.
 
@@ -272,16 +443,16 @@ def _strip_grade_from_name(card_name):
         Card name string with the grade marker stripped and surrounding
         whitespace cleaned up.
     """
-    name = re.sub(r'\s*\[(?:PSA|BGS|CGC|SGC|CSG)\s+[\d.]+[^\]]*\]', '', card_name)
-    name = re.sub(r'\s+(?:PSA|BGS|CGC|SGC|CSG)\s+\d+(?:\.\d+)?\s*$', '', name, flags=re.IGNORECASE)
+    name = _GRADE_BRACKET_RE.sub('', card_name)
+    name = _GRADE_INLINE_RE.sub('', name)
     return name.strip()
 
 
 def scrape_single_card(card_name, username):
     """Scrape eBay sold listings for one card and persist the results to Supabase.
 
-    Launches a headless Chrome driver, searches eBay for the card, applies
-    variant/parallel filtering, and falls back to simplified queries or grade
+    Reuses the shared headless Chrome driver, searches eBay for the card,
+    applies variant/parallel filtering, and falls back to simplified queries or grade
     estimation (raw → PSA 9, raw/PSA 9 → PSA 10) when no direct comps are
     found.  Merges new sales with any previously stored sales in ``card_results``,
     preserves existing ``image_url`` data, and upserts the updated row.
@@ -295,55 +466,53 @@ def scrape_single_card(card_name, username):
         Stats dict from ``calculate_fair_price`` (keys include ``fair_price``,
         ``num_sales``, ``min``, ``max``, ``median``) when sales are found, or
         ``None`` when no comparable sales could be located.
+
+    Raises:
+        WebDriverException: The browser failed; the shared driver has been
+            quit so the next scrape launches a fresh one.
     """
-    driver = create_driver()
-    try:
-        sales = search_ebay_sold(driver, card_name)
-        # Filter to comps that match the card's specific variant/parallel
-        sales = _filter_sales_by_variant(card_name, sales)
-
-        # Retry with simplified query if no results
-        if not sales:
-            simplified = build_simplified_query(card_name)
-            grade_str, grade_num = get_grade_info(card_name)
-            encoded = urllib.parse.quote(simplified)
-            url = f"https://www.ebay.com/sch/i.html?_nkw={encoded}&_sacat=0&LH_Complete=1&LH_Sold=1&_sop=13&_ipg=240"
-            try:
-                driver.get(url)
-                WebDriverWait(driver, 15).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, '.s-card'))
-                )
-                items = driver.find_elements(By.CSS_SELECTOR, '.s-card')
-                for item in items:
-                    try:
-                        title_elem = item.find_element(By.CSS_SELECTOR, '.s-card__title')
-                        title = title_elem.text.strip()
-                        if not title or not title_matches_grade(title, grade_str, grade_num):
-                            continue
-                        price_elem = item.find_element(By.CSS_SELECTOR, '.s-card__price')
-                        price_text = price_elem.text.strip().replace('Opens in a new window', '')
-                        price_match = re.search(r'\$([\d,]+\.?\d*)', price_text)
-                        if not price_match:
-                            continue
-                        price_val = float(price_match.group(1).replace(',', ''))
-                        shipping_val = 0.0
+    with _driver_lock:
+        try:
+            driver = _get_driver()
+            sales = search_ebay_sold(driver, card_name)
+            # Filter to comps that match the card's specific variant/parallel
+            sales = _filter_sales_by_variant(card_name, sales)
+
+            # Retry with simplified query if no results
+            if not sales:
+                simplified = build_simplified_query(card_name)
+                grade_str, grade_num = get_grade_info(card_name)
+                encoded = urllib.parse.quote(simplified)
+                url = f"https://www.ebay.com/sch/i.html?_nkw={encoded}&_sacat=0&LH_Complete=1&LH_Sold=1&_sop=13&_ipg=240"
+                try:
+                    driver.get(url)
+                    WebDriverWait(driver, 15).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, '.s-card'))
+                    )
+                    # One round-trip for every card's fields instead of 4-5
+                    # find_element calls per listing over the WebDriver protocol.
+                    items = driver.execute_script(_EBAY_ITEMS_JS) or []
+                    for item in items:
                         try:
-                            ship_elems = item.find_elements(By.XPATH,
-                                './/*[contains(text(),"delivery") or contains(text(),"shipping")]')
-                            for se in ship_elems:
-                                se_text = se.text.strip().lower()
+                            title = (item.get('title') or '').strip()
+                            if not title or not title_matches_grade(title, grade_str, grade_num):
+                                continue
+                            price_text = (item.get('price') or '').strip().replace('Opens in a new window', '')
+                            price_match = _PRICE_RE.search(price_text)
+                            if not price_match:
+                                continue
+                            price_val = float(price_match.group(1).replace(',', ''))
+                            shipping_val = 0.0
+                            for se_text in item.get('shipping') or []:
+                                se_text = se_text.strip().lower()
                                 if 'free' in se_text:
                                     break
-                                sm = re.search(r'\$([\d,]+\.?\d*)', se_text)
+                                sm = _PRICE_RE.search(se_text)
                                 if sm:
                                     shipping_val = float(sm.group(1).replace(',', ''))
                                     break
-                        except Exception:
-                            pass
-                        sold_date = None
-                        try:
-                            caption = item.find_element(By.CSS_SELECTOR, '.s-card__caption')
-                            dm = re.search(r'Sold\s+(\w+\s+\d+,?\s*\d*)', caption.text.strip())
+                            sold_date = None
+                            dm = _SOLD_DATE_RE.search((item.get('caption') or '').strip())
                             if dm:
                                 try:
                                     sold_date = datetime.strptime(dm.group(1), '%b %d, %Y')
@@ -352,85 +521,100 @@ def scrape_single_card(card_name, username):
                                         sold_date = datetime.strptime(dm.group(1) + f', {datetime.now().year}', '%b %d, %Y')
                                     except ValueError:
                                         pass
+                            sales.append({
+                                'title': title,
+                                'item_price': price_match.group(0),
+                                'shipping': f"${shipping_val}" if shipping_val > 0 else 'Free',
+                                'price_val': round(price_val + shipping_val, 2),
+                                'sold_date': sold_date.strftime('%Y-%m-%d') if sold_date else None,
+                                'days_ago': (datetime.now() - sold_date).days if sold_date else None,
+                                'search_url': url
+                            })
+                            if len(sales) >= 50:
+                                break
                         except Exception:
-                            pass
-                        sales.append({
-                            'title': title,
-                            'item_price': price_match.group(0),
-                            'shipping': f"${shipping_val}" if shipping_val > 0 else 'Free',
-                            'price_val': round(price_val + shipping_val, 2),
-                            'sold_date': sold_date.strftime('%Y-%m-%d') if sold_date else None,
-                            'days_ago': (datetime.now() - sold_date).days if sold_date else None,
-                            'search_url': url
-                        })
-                        if len(sales) >= 50:
-                            break
-                    except Exception:
-                        continue
-            except Exception:
-                pass
-            # Apply variant filter to simplified results too
-            sales = _filter_sales_by_variant(card_name, sales)
-
-        # ── Graded card estimation fallback ──────────────────────────────────
-        # When no direct comps exist, estimate from raw or PSA-9 comps.
-        # PSA 9  ≈ raw price   (1×)
-        # PSA 10 ≈ 2.5× raw or 2.5× PSA 9
-        is_estimated = False
-        price_source = 'direct'
-        if not sales:
-            grade_str, grade_num = get_grade_info(card_name)
-            if grade_str and grade_num:
-                raw_name = _strip_grade_from_name(card_name)
-                if raw_name and raw_name != card_name:
-                    raw_sales = search_ebay_sold(driver, raw_name, max_results=30)
-                    raw_sales = _filter_sales_by_variant(raw_name, raw_sales)
-                    if raw_sales:
-                        if grade_num == 9:
-                            sales = raw_sales
-                            is_estimated = True
-                            price_source = 'raw_estimate'
-                        elif grade_num == 10:
-                            sales = [{**s, 'price_val': round(s.get('price_val', 0) * 2.5, 2)}
-                                     for s in raw_sales]
-                            is_estimated = True
-                            price_source = 'raw_estimate_psa10'
-                # PSA 10 secondary fallback: PSA 9 comps × 2.5
-                if not sales and grade_num == 10:
-                    psa9_name = re.sub(r'\bPSA\s*10\b', 'PSA 9', card_name, flags=re.IGNORECASE)
-                    if psa9_name != card_name:
-                        psa9_sales = search_ebay_sold(driver, psa9_name, max_results=30)
-                        psa9_sales = _filter_sales_by_variant(psa9_name, psa9_sales)
-                        if psa9_sales:
-                            sales = [{**s, 'price_val': round(s.get('price_val', 0) * 2.5, 2)}
-                                     for s in psa9_sales]
-                            is_estimated = True
-                            price_source = 'psa9_estimate'
-
-        if sales:
-            from scrape_card_prices import extract_serial_run, _normalize_shipping
-            target_serial = extract_serial_run(card_name)
-            sales = _normalize_shipping(sales)
-            fair_price, stats = calculate_fair_price(sales, target_serial=target_serial)
-            # Load existing card_results to merge/preserve image_url
-            existing_data = load_card_results(username, card_name)
-            existing_sales = existing_data.get('raw_sales', [])
-            merged = _merge_sales(sales, existing_sales)
-            image_url = existing_data.get('image_url') or next(
-                (s.get('image_url') for s in sales if s.get('image_url')), None
-            )
-            save_card_results(
-                username, card_name,
-                raw_sales=merged,
-                scraped_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                confidence=stats.get('confidence', ''),
-                image_url=image_url,
-                image_hash=existing_data.get('image_hash', ''),
-            )
-            return stats
+                            continue
+                except Exception:
+                    pass
+                # Apply variant filter to simplified results too
+                sales = _filter_sales_by_variant(card_name, sales)
+
+            # ── Graded card estimation fallback ──────────────────────────────────
+            # When no direct comps exist, estimate from raw or PSA-9 comps.
+            # PSA 9  ≈ raw price   (1×)
+            # PSA 10 ≈ 2.5× raw or 2.5× PSA 9
+            is_estimated = False
+            price_source = 'direct'
+            if not sales:
+                grade_str, grade_num = get_grade_info(card_name)
+                if grade_str and grade_num:
+                    raw_name = _strip_grade_from_name(card_name)
+                    if raw_name and raw_name != card_name:
+                        raw_sales = search_ebay_sold(driver, raw_name, max_results=30)
+                        raw_sales = _filter_sales_by_variant(raw_name, raw_sales)
+                        if raw_sales:
+                            if grade_num == 9:
+                                sales = raw_sales
+                                is_estimated = True
+                                price_source = 'raw_estimate'
+                            elif grade_num == 10:
+                                sales = [{**s, 'price_val': round(s.get('price_val', 0) * 2.5, 2)}
+                                         for s in raw_sales]
+                                is_estimated = True
+                                price_source = 'raw_estimate_psa10'
+                    # PSA 10 secondary fallback: PSA 9 comps × 2.5
+                    if not sales and grade_num == 10:
+                        psa9_name = _PSA10_RE.sub('PSA 9', card_name)
+                        if psa9_name != card_name:
+                            psa9_sales = search_ebay_sold(driver, psa9_name, max_results=30)
+                            psa9_sales = _filter_sales_by_variant(psa9_name, psa9_sales)
+                            if psa9_sales:
+                                sales = [{**s, 'price_val': round(s.get('price_val', 0) * 2.5, 2)}
+                                         for s in psa9_sales]
+                                is_estimated = True
+                                price_source = 'psa9_estimate'
+        except WebDriverException:
+            # A dead or wedged browser is replaced on the next scrape rather
+            # than poisoning every later one.
+            _quit_driver()
+            raise
+
+    # Browser work is done — the lock only guards the shared driver, so the
+    # fair-price maths and card_results I/O below run outside it
+    if not sales:
         return None
-    finally:
-        driver.quit()
+    from scrape_card_prices import extract_serial_run, _normalize_shipping
+    target_serial = extract_serial_run(card_name)
+    sales = _normalize_shipping(sales)
+    fair_price, stats = calculate_fair_price(sales, target_serial=target_serial)
+    # Load existing card_results to merge/preserve image_url
+    existing_data = load_card_results(username, card_name)
+    existing_sales = existing_data.get('raw_sales', [])
+    merged = _merge_sales(sales, existing_sales)
+    image_url = existing_data.get('image_url') or next(
+        (s.get('image_url') for s in sales if s.get('image_url')), None
+    )
+    save_card_results(
+        username, card_name,
+        raw_sales=merged,
+        scraped_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        confidence=stats.get('confidence', ''),
+        image_url=image_url,
+        image_hash=existing_data.get('image_hash', ''),
+    )
+    return stats
+
+
+# Patterns used by parse_card_name, compiled once at import
+_SERIAL_RE      = re.compile(r'#?(\d+)\s*/\s*(\d+)')
+_PSA_BRACKET_RE = re.compile(r'\[([^\]]*PSA[^\]]*)\]', re.IGNORECASE)
+_PSA_GRADE_RE   = re.compile(r'\b(PSA\s+\d+)\b', re.IGNORECASE)
+_YEAR_RE        = re.compile(r'(\d{4}(?:-\d{2,4})?)')
+_CARD_NUM_RE    = re.compile(r'#([\w-]+)(?!\s*/)')
+_BRACKETS_RE    = re.compile(r'\[.*?\]')
+_HASH_SERIAL_RE = re.compile(r'#\d+/\d+')
+_LONE_NUMBER_RE = re.compile(r'^#\S+$')
+
 
 def parse_card_name(card_name):
     """Parse a structured card name string into its constituent fields.
@@ -461,16 +645,16 @@ def parse_card_name(card_name):
         return result
 
     # Extract serial number (e.g. #70/99, /250, #1/250)
-    serial_match = re.search(r'#?(\d+)\s*/\s*(\d+)', card_name)
+    serial_match = _SERIAL_RE.search(card_name)
     if serial_match:
         result['Serial'] = f"{serial_match.group(1)}/{serial_match.group(2)}"
 
     # Extract grade (bracketed or unbracketed)
-    grade_match = re.search(r'\[([^\]]*PSA[^\]]*)\]', card_name, re.IGNORECASE)
+    grade_match = _PSA_BRACKET_RE.search(card_name)
     if grade_match:
         result['Grade'] = grade_match.group(1).strip()
     else:
-        grade_match = re.search(r'\b(PSA\s+\d+)\b', card_name, re.IGNORECASE)
+        grade_match = _PSA_GRADE_RE.search(card_name)
         if grade_match:
             result['Grade'] = grade_match.group(1).strip()
 
@@ -479,7 +663,7 @@ def parse_card_name(card_name):
         parts = [p.strip() for p in card_name.split(' - ')]
 
         # Year: from first segment
-        year_match = re.search(r'(\d{4}(?:-\d{2,4})?)', parts[0])
+        year_match = _YEAR_RE.search(parts[0])
         if year_match:
             result['Year'] = year_match.group(1)
 
@@ -487,7 +671,7 @@ def parse_card_name(card_name):
         result['Set'] = ' '.join(parts[0].split()).strip()
 
         # Card #: find #NNN or #CU-SC pattern (not serial numbered #70/99)
-        num_match = re.search(r'#([\w-]+)(?!\s*/)', card_name)
+        num_match = _CARD_NUM_RE.search(card_name)
         if num_match:
             raw_num = num_match.group(1)
             # Skip serial numbers like 70/99, 1/250
@@ -500,11 +684,11 @@ def parse_card_name(card_name):
         middle_parts = parts[1:]  # everything after Set
         cleaned_middle = []
         for part in middle_parts:
-            clean = re.sub(r'\[.*?\]', '', part).strip()
-            clean = re.sub(r'#\d+/\d+', '', clean).strip()
-            clean = re.sub(r'\bPSA\s+\d+\b', '', clean, flags=re.IGNORECASE).strip()
+            clean = _BRACKETS_RE.sub('', part).strip()
+            clean = _HASH_SERIAL_RE.sub('', clean).strip()
+            clean = _PSA_GRADE_RE.sub('', clean).strip()
             # Skip segments that are only a card number like "#12" or empty
-            clean = re.sub(r'^#\S+$', '', clean).strip()
+            clean = _LONE_NUMBER_RE.sub('', clean).strip()
             if clean:
                 cleaned_middle.append(clean)
 
@@ -516,18 +700,69 @@ def parse_card_name(card_name):
     else:
         # Freeform format - put the whole name as Player, stripping grade and serial
         player = card_name
-        player = re.sub(r'\[.*?\]', '', player).strip()
-        player = re.sub(r'#?\d+\s*/\s*\d+', '', player).strip()
-        player = re.sub(r'\bPSA\s+\d+\b', '', player, flags=re.IGNORECASE).strip()
+        player = _BRACKETS_RE.sub('', player).strip()
+        player = _SERIAL_RE.sub('', player).strip()
+        player = _PSA_GRADE_RE.sub('', player).strip()
         result['Player'] = player
         # Try to extract year
-        year_match = re.search(r'(\d{4}(?:-\d{2,4})?)', card_name)
+        year_match = _YEAR_RE.search(card_name)
         if year_match:
             result['Year'] = year_match.group(1)
 
     return result
 
 
+_PARSED_KEYS = ('Player', 'Year', 'Set', 'Subset', 'Card #', 'Serial', 'Grade')
+
+
+@functools.lru_cache(maxsize=16384)
+def _parse_card_name_cached(card_name: str) -> tuple:
+    """Memoized :func:`parse_card_name`, as an immutable tuple in ``_PARSED_KEYS`` order."""
+    parsed = parse_card_name(card_name)
+    return tuple(parsed[k] for k in _PARSED_KEYS)
+
+
+def parse_card_names(names) -> list:
+    """Parse many card names at once — see :func:`parse_card_name`.
+
+    Results are memoized per name, so reloading a ledger after a write only
+    runs the regex heuristics for names not seen before.
+
+    Args:
+        names: Iterable of raw card name strings.
+
+    Returns:
+        List of dicts (one per name, in order) with the same keys as
+        :func:`parse_card_name`.
+    """
+    return [dict(zip(_PARSED_KEYS, _parse_card_name_cached(n))) for n in names]
+
+
+# ── Ledger data versioning ──────────────────────────────────────
+# Per-user counter bumped on every in-process write to ``cards`` or
+# ``card_results``.  Readers use ``(username, version)`` as a cheap cache key
+# instead of hashing DataFrames.  Writes from outside this process (scheduled
+# scrapers) don't bump it, so caches keyed on it should still carry a TTL.
+_data_versions: dict = {}
+_data_versions_lock = threading.Lock()
+
+_ledger_cache: TTLCache = TTLCache(maxsize=64, ttl=60)   # 1 min
+_card_index_cache: TTLCache = TTLCache(maxsize=64, ttl=60)   # 1 min
+_ledger_cache_lock = threading.Lock()
+
+
+def get_data_version(username: str) -> int:
+    """Return the current ledger data version for ``username``."""
+    return _data_versions.get(username, 0)
+
+
+def bump_data_version(username: str) -> int:
+    """Invalidate cached views of ``username``'s ledger and return the new version."""
+    with _data_versions_lock:
+        _data_versions[username] = _data_versions.get(username, 0) + 1
+        return _data_versions[username]
+
+
 _COL_FROM_DB = {
     'card_name':    'Card Name',
     'fair_value':   'Fair Value',
@@ -544,8 +779,128 @@ _COL_FROM_DB = {
 _COL_TO_DB = {v: k for k, v in _COL_FROM_DB.items()}
 
 
+def normalize_trend(trend) -> str:
+    """Map a scraper trend label onto one of the ``TREND_DTYPE`` categories.
+
+    Args:
+        trend: Raw trend string from the scraper (e.g. ``"up"``,
+            ``"insufficient data"``), or ``None``.
+
+    Returns:
+        ``"up"``, ``"down"``, ``"stable"`` or ``"no data"``.
+    """
+    trend = _TREND_ALIASES.get(trend, trend)
+    return trend if trend in TREND_DTYPE.categories else 'no data'
+
+
+def _coerce_money_cols(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert every present ``MONEY_COLS`` column to numeric in one pass.
+
+    Columns that already hold numbers or ``Decimal`` values (the usual case
+    straight from PostgreSQL) are converted directly.  Only columns holding
+    formatted strings take the slow path: ``$``, ``,`` and whitespace are
+    stripped with a single regex replace across those columns at once, then
+    coerced to numeric.  Unparseable or missing values become ``0``.
+
+    Args:
+        df: DataFrame whose money columns may hold numbers, ``Decimal`` values
+            or formatted strings such as ``"$1,234.50"``.
+
+    Returns:
+        The same DataFrame with its money columns as numeric dtypes.
+    """
+    cols = []
+    for c in MONEY_COLS:
+        if c not in df.columns:
+            continue
+        try:
+            df[c] = pd.to_numeric(df[c]).fillna(0)
+        except (ValueError, TypeError):
+            cols.append(c)
+    if cols:
+        df[cols] = (
+            df[cols].astype(str)
+            .replace(r'[$,\s]', '', regex=True)
+            .apply(pd.to_numeric, errors='coerce')
+            .fillna(0)
+        )
+    return df
+
+
 def load_data(username: str) -> pd.DataFrame:
-    """Load the active card collection for a user from PostgreSQL."""
+    """Load the active card collection for a user from PostgreSQL.
+
+    Results are cached per ``(username, data version)`` for up to 60 s, so
+    the several endpoints that call this per request share one DB read.
+    Callers receive a copy and may mutate it freely; the version it was
+    loaded at is kept in ``df.attrs['data_version']``.
+    """
+    return _cached_ledger(username).copy()
+
+
+def _cached_ledger(username: str) -> pd.DataFrame:
+    """Return the shared cached ledger frame — callers must not mutate it."""
+    version = get_data_version(username)
+    cache_key = (username, version)
+    with _ledger_cache_lock:
+        df = _ledger_cache.get(cache_key)
+    if df is None:
+        df = _load_data_from_db(username)
+        df.attrs['data_version'] = version
+        with _ledger_cache_lock:
+            _ledger_cache[cache_key] = df
+    return df
+
+
+def _card_index(username: str) -> tuple:
+    """Return ``(data version, index)`` — see :func:`card_index`."""
+    version = get_data_version(username)
+    cache_key = (username, version)
+    with _ledger_cache_lock:
+        index = _card_index_cache.get(cache_key)
+    if index is None:
+        df = _cached_ledger(username)
+        # Reversed so the first row wins for any duplicate name, like .index[0]
+        index = dict(zip(df['Card Name'].tolist()[::-1], df.index.tolist()[::-1]))
+        with _ledger_cache_lock:
+            _card_index_cache[cache_key] = index
+    return version, index
+
+
+def card_index(username: str) -> dict:
+    """Map each active card name to its row label in :func:`load_data` frames.
+
+    Built once per ``(username, data version)`` alongside the cached ledger,
+    so existence checks and row lookups are a dict hit instead of a scan over
+    the Card Name column (and need no DataFrame copy).
+
+    Returns:
+        Dict of ``{card_name: index label}``. Do not mutate.
+    """
+    return _card_index(username)[1]
+
+
+def find_card(df: pd.DataFrame, username: str, card_name: str):
+    """Return the row label of ``card_name`` in ``df``, or ``None`` if absent.
+
+    ``df`` must come from ``load_data(username)``. Uses :func:`card_index` and
+    verifies the hit. A miss is final when the index was built at the same
+    data version as ``df``; only when a write bumped the version between the
+    two reads (or the hit doesn't match ``df``) is the column scanned.
+    """
+    version, index = _card_index(username)
+    i = index.get(card_name)
+    if i is None:
+        if df.attrs.get('data_version') == version:
+            return None
+    elif i in df.index and df.at[i, 'Card Name'] == card_name:
+        return i
+    idx = df.index[df['Card Name'] == card_name]
+    return idx[0] if len(idx) else None
+
+
+def _load_data_from_db(username: str) -> pd.DataFrame:
+    """Uncached body of :func:`load_data`."""
     with get_db() as conn:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
             cur.execute(
@@ -565,12 +920,19 @@ def load_data(username: str) -> pd.DataFrame:
         if drop_col in df.columns:
             df = df.drop(columns=[drop_col])
 
+    # Arrow-backed Card Name: the equality / isin lookups every endpoint does
+    # run in Arrow's string kernels over one contiguous buffer. pandas >= 3
+    # already stores str columns this way; older versions need the cast.
+    if HAS_PYARROW and getattr(df['Card Name'].dtype, 'storage', None) != 'pyarrow':
+        df['Card Name'] = df['Card Name'].astype('string[pyarrow]')
+
     # Normalize money columns
-    for col in MONEY_COLS:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-    df['Num Sales'] = pd.to_numeric(df.get('Num Sales', 0), errors='coerce').fillna(0).astype(int)
-    df['Trend'] = df['Trend'].replace({'insufficient data': 'no data', 'unknown': 'no data'}).fillna('no data')
+    df = _coerce_money_cols(df)
+    # Sale counts are small — int32 halves the column; save_data and to_dict
+    # still hand back plain Python ints
+    df['Num Sales'] = pd.to_numeric(df.get('Num Sales', 0), errors='coerce').fillna(0).astype('int32')
+    # Values outside TREND_DTYPE (blank, legacy labels) become NaN on the cast
+    df['Trend'] = df['Trend'].replace(_TREND_ALIASES).astype(TREND_DTYPE).fillna('no data')
     df['Tags'] = df['Tags'].fillna('')
     df['Top 3 Prices'] = df['Top 3 Prices'].fillna('')
     df['Purchase Date'] = df['Purchase Date'].fillna('')
@@ -583,23 +945,29 @@ def load_data(username: str) -> pd.DataFrame:
                 (username,)
             )
             res_rows = cur.fetchall()
-    res_map = {r['card_name']: r for r in res_rows}
-    df['Last Scraped'] = df['Card Name'].map(
-        lambda n: (str(res_map.get(n, {}).get('scraped_at') or ''))[:10]
-    )
-    df['Confidence'] = df['Card Name'].map(
-        lambda n: res_map.get(n, {}).get('confidence') or ''
-    )
-    df['Image URL'] = df['Card Name'].map(
-        lambda n: res_map.get(n, {}).get('image_url') or ''
+    # One keyed join instead of three per-row dict lookups; cards without a
+    # result row (or with NULL/blank values) get ''
+    res = (
+        pd.DataFrame(res_rows, columns=['card_name', 'scraped_at', 'confidence', 'image_url'])
+        .drop_duplicates('card_name', keep='last')
+        .set_index('card_name')
+        .reindex(df['Card Name'])
     )
+    res = res.astype(object).where(res.notna() & (res != ''), '')
+    df['Last Scraped'] = res['scraped_at'].astype(str).str[:10].to_numpy()
+    df['Confidence'] = res['confidence'].to_numpy()
+    df['Image URL'] = res['image_url'].to_numpy()
 
     # Parse card names into display columns
     parse_cols = ['Player', 'Year', 'Set', 'Subset', 'Card #', 'Serial', 'Grade']
     if len(df) > 0:
-        parsed = df['Card Name'].apply(parse_card_name).apply(pd.Series)
-        for col in parse_cols:
-            df[col] = parsed[col] if col in parsed.columns else ''
+        # Build the frame straight from the parsed dicts — .apply(pd.Series)
+        # would construct one intermediate Series per card
+        parsed = pd.DataFrame(
+            parse_card_names(df['Card Name']),
+            columns=parse_cols, index=df.index,
+        )
+        df[parse_cols] = parsed
     else:
         for col in parse_cols:
             df[col] = pd.Series(dtype='object')
@@ -609,27 +977,29 @@ def load_data(username: str) -> pd.DataFrame:
 PARSED_COLS = ['Player', 'Year', 'Set', 'Subset', 'Card #', 'Serial', 'Grade', 'Last Scraped', 'Confidence']
 
 
+# ``cards`` columns written by ``save_data``, in INSERT order (after user_id)
+_SAVE_COLS = ['card_name', 'fair_value', 'trend', 'top_3_prices', 'median_all',
+              'min_price', 'max_price', 'num_sales', 'tags', 'cost_basis',
+              'purchase_date']
+
+
 def save_data(df: pd.DataFrame, username: str) -> None:
     """Upsert the card collection DataFrame to Supabase.
 
-    Drops display-only parsed columns before saving and converts
-    DataFrame column names back to snake_case for the ``cards`` table.
+    Converts DataFrame column names back to snake_case and keeps only the
+    ``cards`` table columns (``_SAVE_COLS``), so display-only parsed columns
+    are never written.  Missing values are mapped to SQL ``NULL`` in one
+    vectorized pass.
 
     Args:
         df: Card collection DataFrame as returned by ``load_data``.
         username: Username whose ``cards`` rows to upsert.
     """
-    save_df = df.drop(columns=[c for c in PARSED_COLS if c in df.columns], errors='ignore').copy()
-    save_df = save_df.rename(columns=_COL_TO_DB)
-
-    rows = []
-    for rec in save_df.to_dict('records'):
-        rec['user_id'] = username
-        rec['archived'] = False
-        for k, v in rec.items():
-            if isinstance(v, float) and pd.isna(v):
-                rec[k] = None
-        rows.append(rec)
+    save_df = df.rename(columns=_COL_TO_DB).reindex(columns=_SAVE_COLS)
+    # NaN/NA → None for the whole frame at once; object dtype also turns
+    # numpy scalars into plain Python values psycopg2 can adapt
+    save_df = save_df.astype(object).where(save_df.notna(), None)
+    rows = [(username, *r, False) for r in save_df.itertuples(index=False, name=None)]
 
     with get_db() as conn:
         with conn.cursor() as cur:
@@ -652,14 +1022,8 @@ def save_data(df: pd.DataFrame, username: str) -> None:
                         cost_basis    = EXCLUDED.cost_basis,
                         purchase_date = EXCLUDED.purchase_date,
                         updated_at    = NOW()
-                """, [
-                    (r.get('user_id'), r.get('card_name'), r.get('fair_value'),
-                     r.get('trend'), r.get('top_3_prices'), r.get('median_all'),
-                     r.get('min_price'), r.get('max_price'), r.get('num_sales'),
-                     r.get('tags'), r.get('cost_basis'), r.get('purchase_date'),
-                     r.get('archived', False))
-                    for r in rows[i:i + 500]
-                ])
+                """, rows[i:i + 500])
+    bump_data_version(username)
 
 
 def load_card_results(username: str, card_name: str) -> dict:
@@ -757,6 +1121,7 @@ def save_card_results(username: str, card_name: str, raw_sales: list,
                 image_url_back or '', search_url or '',
                 bool(is_estimated), price_source or 'direct',
             ))
+    bump_data_version(username)
 
 
 def load_sales_history(username: str, card_name: str) -> list:
@@ -961,7 +1326,9 @@ def archive_card(df: pd.DataFrame, username: str, card_name: str) -> pd.DataFram
     Returns:
         Updated DataFrame with the specified card removed.
     """
-    if df[df['Card Name'] == card_name].empty:
+    # One boolean mask serves both the existence check and the removal
+    mask = df['Card Name'].isin([card_name])
+    if not mask.any():
         return df
 
     with get_db() as conn:
@@ -970,8 +1337,9 @@ def archive_card(df: pd.DataFrame, username: str, card_name: str) -> pd.DataFram
                 UPDATE cards SET archived = TRUE, archived_date = NOW()
                 WHERE user_id = %s AND card_name = %s
             """, (username, card_name))
+    bump_data_version(username)
 
-    return df[df['Card Name'] != card_name].reset_index(drop=True)
+    return df[~mask].reset_index(drop=True)
 
 
 def load_archive(username: str) -> pd.DataFrame:
@@ -1000,10 +1368,7 @@ def load_archive(username: str) -> pd.DataFrame:
     for drop_col in ('id', 'user_id', 'archived', 'archived_date', 'created_at', 'updated_at'):
         if drop_col in df.columns:
             df = df.drop(columns=[drop_col])
-    for col in MONEY_COLS:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-    return df
+    return _coerce_money_cols(df)
 
 
 def restore_card(username: str, card_name: str) -> dict | None:
@@ -1031,6 +1396,7 @@ def restore_card(username: str, card_name: str) -> dict | None:
                 UPDATE cards SET archived = FALSE, archived_date = NULL
                 WHERE user_id = %s AND card_name = %s
             """, (username, card_name))
+    bump_data_version(username)
 
     raw = dict(row)
     return {_COL_FROM_DB.get(k, k): v for k, v in raw.items()}
@@ -1248,7 +1614,7 @@ def compute_correlation_snapshot(cards_df, nhl_players, nhl_standings):
     paired_goalies = []
     seen_players = set()
 
-    for _, row in cards_df.iterrows():
+    for row in cards_df.to_dict('records'):
         pname = row['PlayerName']
         if pname in seen_players:
             continue
@@ -2099,7 +2465,7 @@ def compute_impact_scores(master_df, nhl_players, team_multipliers=None):
         data are excluded.
     """
     raw = {}
-    for _, row in master_df.iterrows():
+    for row in master_df.to_dict('records'):
         pname = row['PlayerName']
         if pname in raw:
             continue
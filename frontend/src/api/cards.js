@@ -9,7 +9,7 @@ export const addCard        = (data)       => client.post('/cards', data)
 export const updateCard     = (name, data) => client.patch('/cards/update', data, { params: { name } })
 export const archiveCard    = (name)       => client.delete('/cards/archive', { params: { name } })
 export const restoreCard    = (name)       => client.post('/cards/restore', null, { params: { name } })
-export const scrapeCard     = (name)       => client.post('/cards/scrape', null, { params: { name } })
+export const scrapeCard     = (name, force) => client.post('/cards/scrape', null, { params: { name, force } })
 export const fetchImage     = (name)       => client.post('/cards/fetch-image', null, { params: { name } })
 export const getCardOfTheDay = ()          => client.get('/cards/card-of-the-day')
 export const bulkImport     = (file)       => {
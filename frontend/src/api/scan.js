@@ -37,3 +37,39 @@ export const analyzeCard = async (frontFile, backFile = null) => {
 
   return res.json()
 }
+
+/**
+ * Send a stack of card front images for analysis in one request.
+ * The server fans the Claude calls out concurrently; results come back in
+ * upload order, each shaped like analyzeCard's response plus `filename`
+ * (and `error` if that card failed).
+ *
+ * @param {File[]} frontFiles
+ */
+export const analyzeCardBatch = async (frontFiles) => {
+  const form = new FormData()
+  frontFiles.forEach(f => form.append('files', f))
+
+  const token = localStorage.getItem('auth_token')
+  const headers = token ? { Authorization: `Bearer ${token}` } : {}
+
+  const res = await fetch('/api/scan/analyze-batch', {
+    method: 'POST',
+    body: form,
+    headers,
+    signal: AbortSignal.timeout(180000),
+  })
+
+  if (!res.ok) {
+    const data = await res.json().catch(() => ({}))
+    const detail = data.detail
+    const msg = typeof detail === 'string'
+      ? detail
+      : Array.isArray(detail)
+        ? detail.map(d => d.msg ?? JSON.stringify(d)).join(', ')
+        : `HTTP ${res.status}`
+    throw new Error(msg)
+  }
+
+  return (await res.json()).results
+}
@@ -1,5 +1,5 @@
 import { useState, useRef } from 'react'
-import { analyzeCard } from '../api/scan'
+import { analyzeCard, analyzeCardBatch } from '../api/scan'
 import { addCard, scrapeCard } from '../api/cards'
 import { useIsGuest } from '../context/AuthContext'
 import styles from './ScanCardModal.module.css'
@@ -31,6 +31,12 @@ export default function ScanCardModal({ onClose, onAdded }) {
   const [result,     setResult]     = useState(null)
   const [error,      setError]      = useState(null)
 
+  // Batch scan — several fronts picked at once go through analyzeCardBatch,
+  // then each result is loaded into the form below one at a time
+  const [batchFiles,   setBatchFiles]   = useState(null)
+  const [batchResults, setBatchResults] = useState(null)
+  const [batchIndex,   setBatchIndex]   = useState(0)
+
   // Serial override — lets user fill in what the AI missed
   const [serialOverride, setSerialOverride] = useState('')
 
@@ -62,6 +68,23 @@ export default function ScanCardModal({ onClose, onAdded }) {
     if (file) pickFile(file, setFile, setPreview)
   }
 
+  const pickFronts = fileList => {
+    const files = Array.from(fileList || [])
+    setBatchFiles(files.length > 1 ? files : null)
+    pickFile(files[0], setFrontFile, setFrontPreview)
+  }
+
+  const selectBatchResult = (results, i) => {
+    const data = results[i]
+    resultRef.current = data
+    setResult(data)
+    setBatchIndex(i)
+    setSerialOverride('')
+    setSaved(false)
+    setCardName(data.error || data.is_sports_card === false ? '' : buildCardName(data, ''))
+    pickFile(batchFiles[i], setFrontFile, setFrontPreview)
+  }
+
   const handleAnalyze = async () => {
     if (!frontFile) return
     setAnalyzing(true)
@@ -69,6 +92,13 @@ export default function ScanCardModal({ onClose, onAdded }) {
     setResult(null)
     setSerialOverride('')
     try {
+      if (batchFiles) {
+        const results = await analyzeCardBatch(batchFiles)
+        setBatchResults(results)
+        setAnalyzed(true)
+        selectBatchResult(results, 0)
+        return
+      }
       const data = await analyzeCard(frontFile, backFile)
       resultRef.current = data
       setResult(data)
@@ -118,6 +148,7 @@ export default function ScanCardModal({ onClose, onAdded }) {
     setFrontFile(null); setBackFile(null)
     setFrontPreview(null); setBackPreview(null)
     setSerialOverride(''); setError(null)
+    setBatchFiles(null); setBatchResults(null); setBatchIndex(0)
     resultRef.current = null
   }
 
@@ -166,24 +197,30 @@ export default function ScanCardModal({ onClose, onAdded }) {
           {!saved && !analyzed && (
             <>
               <div className={styles.uploadSection}>
-                <label className={styles.uploadLabel}>Front of card</label>
+                <label className={styles.uploadLabel}>
+                  Front of card <span className={styles.optional}>(pick several to scan a stack)</span>
+                </label>
                 <input
                   ref={frontRef}
                   type="file"
                   accept="image/*"
+                  multiple
                   style={{ display: 'none' }}
-                  onChange={e => pickFile(e.target.files[0], setFrontFile, setFrontPreview)}
+                  onChange={e => pickFronts(e.target.files)}
                 />
                 <DropZone
                   label="Front"
                   file={frontFile}
                   preview={frontPreview}
                   onClick={() => frontRef.current.click()}
-                  onDrop={e => handleDrop(e, setFrontFile, setFrontPreview)}
+                  onDrop={e => { e.preventDefault(); pickFronts(e.dataTransfer.files) }}
                 />
+                {batchFiles && (
+                  <span className={styles.batchCount}>{batchFiles.length} cards selected</span>
+                )}
               </div>
 
-              <div className={styles.uploadSection}>
+              {!batchFiles && <div className={styles.uploadSection}>
                 <label className={styles.uploadLabel}>Back of card <span className={styles.optional}>(optional)</span></label>
                 <input
                   ref={backRef}
@@ -199,7 +236,7 @@ export default function ScanCardModal({ onClose, onAdded }) {
                   onClick={() => backRef.current.click()}
                   onDrop={e => handleDrop(e, setBackFile, setBackPreview)}
                 />
-              </div>
+              </div>}
 
               <button
                 className={styles.analyzeBtn}
@@ -207,7 +244,7 @@ export default function ScanCardModal({ onClose, onAdded }) {
                 disabled={!frontFile || analyzing || isGuest}
                 title={isGuest ? 'Guest accounts cannot use the scanner' : undefined}
               >
-                {analyzing ? 'Analyzing…' : 'Analyze Card'}
+                {analyzing ? 'Analyzing…' : batchFiles ? `Analyze ${batchFiles.length} Cards` : 'Analyze Card'}
               </button>
 
               <hr className={styles.divider} />
@@ -235,6 +272,25 @@ export default function ScanCardModal({ onClose, onAdded }) {
             </div>
           )}
 
+          {/* ── Batch results — click one to load it into the form ── */}
+          {batchResults && (
+            <div className={styles.batchList}>
+              {batchResults.map((r, i) => (
+                <button
+                  key={i}
+                  type="button"
+                  className={`${styles.batchItem} ${i === batchIndex ? styles.batchItemActive : ''}`}
+                  onClick={() => selectBatchResult(batchResults, i)}
+                >
+                  <span className={styles.batchFile}>{r.filename}</span>
+                  <span className={r.error || r.is_sports_card === false ? styles.batchFailed : styles.batchPlayer}>
+                    {r.error ? 'Failed' : r.is_sports_card === false ? 'Not a card' : r.player_name || '—'}
+                  </span>
+                </button>
+              ))}
+            </div>
+          )}
+
           {/* ── Not a card error ── */}
           {result && result.is_sports_card === false && (
             <div className={styles.notCardError}>
@@ -322,13 +378,14 @@ export default function ScanCardModal({ onClose, onAdded }) {
             </div>
           )}
 
-          {result?.parse_error && (
+          {result?.parse_error && !result.error && (
             <div className={styles.aiRaw}>
               <span className={styles.aiTag}>Raw AI output (fill manually below)</span>
               <pre className={styles.rawText}>{result.raw_text}</pre>
             </div>
           )}
 
+          {result?.error && <p className={styles.error}>{result.filename}: {result.error}</p>}
           {error && <p className={styles.error}>{error}</p>}
 
           {/* ── Add New Card form ── */}
@@ -378,7 +435,9 @@ export default function ScanCardModal({ onClose, onAdded }) {
             {saved ? (
               <div className={styles.savedMsg}>
                 ✅ Card added!{scraping ? ' Scraping eBay…' : ' Scrape complete.'}
-                <button className={styles.addAnotherBtn} onClick={resetAll}>Add another</button>
+                {batchResults && batchIndex < batchResults.length - 1
+                  ? <button className={styles.addAnotherBtn} onClick={() => selectBatchResult(batchResults, batchIndex + 1)}>Next card</button>
+                  : <button className={styles.addAnotherBtn} onClick={resetAll}>Add another</button>}
               </div>
             ) : (
               <button
@@ -103,11 +103,14 @@ export default function CardInspect() {
     }
   }
 
-  const handleScrape = async () => {
+  // Shift-click forces a scrape even if one was queued in the last 15 minutes
+  const handleScrape = async (force = false) => {
     setScraping(true)
     try {
-      await scrapeCard(name)
-      showToast('Scrape queued — refresh in ~30s to see updated price')
+      const res = await scrapeCard(name, force)
+      showToast(res?.status === 'recent'
+        ? 'Scrape already queued in the last 15 minutes — shift-click Rescrape to force a refresh'
+        : 'Scrape queued — refresh in ~30s to see updated price')
     } catch (e) {
       showToast(e.message, 'error')
     } finally {
@@ -209,8 +212,9 @@ export default function CardInspect() {
               )}
               <button
                 className={styles.scrapeBtn}
-                onClick={handleScrape}
+                onClick={e => handleScrape(e.shiftKey)}
                 disabled={scraping}
+                title="Re-scrape eBay price (shift-click to force)"
               >
                 {scraping ? 'Queuing…' : '⟳ Rescrape'}
               </button>
@@ -1,13 +1,9 @@
-import { useState, useEffect, useMemo, useRef } from 'react'
+import { useState, useEffect, useMemo, useRef, lazy, Suspense } from 'react'
 import { useNavigate } from 'react-router-dom'
 import TrendBadge from '../components/TrendBadge'
 import ConfidenceBadge from '../components/ConfidenceBadge'
 import ConfirmDialog from '../components/ConfirmDialog'
 import EditCardModal from '../components/EditCardModal'
-import AddCardModal from '../components/AddCardModal'
-import ScanCardModal from '../components/ScanCardModal'
-import BulkUploadModal from '../components/BulkUploadModal'
-import ScrapeProgressModal from '../components/ScrapeProgressModal'
 import { getCards, archiveCard, scrapeCard, updateCard } from '../api/cards'
 import { triggerScrape } from '../api/stats'
 import { useCurrency } from '../context/CurrencyContext'
@@ -17,6 +13,13 @@ import PageTabs from '../components/PageTabs'
 import styles from './CardLedger.module.css'
 import pageStyles from './Page.module.css'
 
+// Toolbar modals are only mounted once opened — load their code on demand
+// rather than with the ledger itself
+const AddCardModal        = lazy(() => import('../components/AddCardModal'))
+const ScanCardModal       = lazy(() => import('../components/ScanCardModal'))
+const BulkUploadModal     = lazy(() => import('../components/BulkUploadModal'))
+const ScrapeProgressModal = lazy(() => import('../components/ScrapeProgressModal'))
+
 const LEDGER_TABS = [
   { to: '/my-cards',            label: 'Tracked'    },
   { to: '/my-cards/collection', label: 'Collection' },
@@ -81,6 +84,7 @@ export default function CardLedger() {
   const [error,   setError]   = useState(null)
 
   const [search,      setSearch]      = useState('')
+  const [debouncedSearch, setDebouncedSearch] = useState('')
   const [trendFilter, setTrendFilter] = useState(new Set(TRENDS))
   const [minPrice,    setMinPrice]    = useState('')
   const [maxPrice,    setMaxPrice]    = useState('')
@@ -107,7 +111,15 @@ export default function CardLedger() {
   const [scrapeEta,          setScrapeEta]          = useState(null)
   const [showScrapeProgress, setShowScrapeProgress] = useState(false)
 
-  const toolsRef = useRef(null)
+  const toolsRef    = useRef(null)
+  const debounceRef = useRef(null)
+
+  // Only re-filter the ledger once typing pauses; clearing applies immediately
+  useEffect(() => {
+    clearTimeout(debounceRef.current)
+    debounceRef.current = setTimeout(() => setDebouncedSearch(search), search ? 250 : 0)
+    return () => clearTimeout(debounceRef.current)
+  }, [search])
 
   useEffect(() => {
     const handler = e => {
@@ -145,17 +157,21 @@ export default function CardLedger() {
   const hasTags      = useMemo(() => cards.some(c => c.tags && c.tags.trim() !== ''), [cards])
   const colCount     = 7 + (hasCostBasis ? 1 : 0) + (hasTags ? 1 : 0) + (!isPublic ? 1 : 0)
 
+  // Lowercased search text per card, built once per card list rather than
+  // re-lowercasing five fields for every card on every keystroke
+  const searchKeys = useMemo(() => new Map(cards.map(c => [c,
+    [c.card_name, c.player, c.set_name, c.year, c.grade].join('\n').toLowerCase(),
+  ])), [cards])
+
   const filtered = useMemo(() => {
-    const s = search.toLowerCase()
+    // Every whitespace-separated term must appear, in any order or field
+    const terms = debouncedSearch.toLowerCase().split(/\s+/).filter(Boolean)
     return cards
       .filter(c => {
-        if (s && !(
-          c.card_name?.toLowerCase().includes(s) ||
-          c.player?.toLowerCase().includes(s) ||
-          c.set_name?.toLowerCase().includes(s) ||
-          c.year?.toString().includes(s) ||
-          c.grade?.toLowerCase().includes(s)
-        )) return false
+        if (terms.length) {
+          const key = searchKeys.get(c)
+          if (!terms.every(t => key.includes(t))) return false
+        }
         const trend = (c.trend || 'no data').toLowerCase()
         if (!trendFilter.has(trend)) return false
         if (minPrice !== '' && (c.fair_value ?? 0) < Number(minPrice)) return false
@@ -178,14 +194,29 @@ export default function CardLedger() {
           : String(av).localeCompare(String(bv), undefined, { numeric: true })
         return sortDir === 'asc' ? cmp : -cmp
       })
-  }, [cards, search, trendFilter, minPrice, maxPrice, yearFilter, gradeFilter, confFilter, setFilter, tagFilter, sortKey, sortDir])
-
-  const totalValue   = cards.reduce((s, c) => s + (c.fair_value  ?? 0), 0)
-  const totalCost    = cards.reduce((s, c) => s + (c.cost_basis  ?? 0), 0)
-  const totalGain    = totalValue - totalCost
-  const priceMin     = Math.floor(Math.min(...cards.map(c => c.fair_value ?? 0).filter(v => v > 0)) || 0)
-  const priceMax     = Math.ceil(Math.max(...cards.map(c => c.fair_value  ?? 0)) || 0)
-  const mostValuable = cards.length ? cards.reduce((best, c) => (c.fair_value ?? 0) > (best.fair_value ?? 0) ? c : best, cards[0]) : null
+  }, [cards, searchKeys, debouncedSearch, trendFilter, minPrice, maxPrice, yearFilter, gradeFilter, confFilter, setFilter, tagFilter, sortKey, sortDir])
+
+  // Summary stats depend only on the card list, not on filters — compute them
+  // in one pass and reuse across filter/sort re-renders.
+  const { totalValue, totalCost, priceMin, priceMax, mostValuable } = useMemo(() => {
+    let value = 0, cost = 0, min = Infinity, max = 0, best = null
+    for (const c of cards) {
+      const fv = c.fair_value ?? 0
+      value += fv
+      cost  += c.cost_basis ?? 0
+      if (fv > 0 && fv < min) min = fv
+      if (fv > max) max = fv
+      if (!best || fv > (best.fair_value ?? 0)) best = c
+    }
+    return {
+      totalValue:   value,
+      totalCost:    cost,
+      priceMin:     Number.isFinite(min) ? Math.floor(min) : 0,
+      priceMax:     Math.ceil(max),
+      mostValuable: best,
+    }
+  }, [cards])
+  const totalGain = totalValue - totalCost
 
   const handleSort = key => {
     if (sortKey === key) setSortDir(d => d === 'asc' ? 'desc' : 'asc')
@@ -241,11 +272,14 @@ export default function CardLedger() {
     }
   }
 
-  const handleScrape = async cardName => {
+  // Shift-click forces a scrape even if one was queued in the last 15 minutes
+  const handleScrape = async (cardName, force = false) => {
     setScraping(prev => ({ ...prev, [cardName]: true }))
     try {
-      await scrapeCard(cardName)
-      showToast('Scrape queued — refresh in ~30s to see updated price')
+      const res = await scrapeCard(cardName, force)
+      showToast(res?.status === 'recent'
+        ? 'Scrape already queued in the last 15 minutes — shift-click ⟳ to force a refresh'
+        : 'Scrape queued — refresh in ~30s to see updated price')
     } catch (e) {
       showToast(e.message, 'error')
     } finally {
@@ -570,9 +604,9 @@ export default function CardLedger() {
                             <button className={styles.btnEdit}    onClick={() => setEditTarget(card)}>Edit</button>
                             <button
                               className={styles.btnScrape}
-                              onClick={() => handleScrape(card.card_name)}
+                              onClick={e => handleScrape(card.card_name, e.shiftKey)}
                               disabled={scraping[card.card_name]}
-                              title="Re-scrape eBay price"
+                              title="Re-scrape eBay price (shift-click to force)"
                             >
                               {scraping[card.card_name] ? '…' : '⟳'}
                             </button>
@@ -590,15 +624,17 @@ export default function CardLedger() {
       </div>
 
       {/* ── Modals ────────────────────────────────────────────── */}
-      {showScrapeProgress && (
-        <ScrapeProgressModal
-          estimatedMins={scrapeEta?.mins}
-          onClose={() => { setShowScrapeProgress(false); load() }}
-        />
-      )}
-      {showAdd      && <AddCardModal    onClose={() => setShowAdd(false)}  onAdded={handleAdded} />}
-      {showScan     && <ScanCardModal   onClose={() => setShowScan(false)} onAdded={() => { setShowScan(false); load() }} />}
-      {showBulk     && <BulkUploadModal onClose={() => setShowBulk(false)} onImported={() => { setShowBulk(false); load() }} />}
+      <Suspense fallback={null}>
+        {showScrapeProgress && (
+          <ScrapeProgressModal
+            estimatedMins={scrapeEta?.mins}
+            onClose={() => { setShowScrapeProgress(false); load() }}
+          />
+        )}
+        {showAdd      && <AddCardModal    onClose={() => setShowAdd(false)}  onAdded={handleAdded} />}
+        {showScan     && <ScanCardModal   onClose={() => setShowScan(false)} onAdded={() => { setShowScan(false); load() }} />}
+        {showBulk     && <BulkUploadModal onClose={() => setShowBulk(false)} onImported={() => { setShowBulk(false); load() }} />}
+      </Suspense>
       {editTarget   && <EditCardModal card={editTarget} onClose={() => setEditTarget(null)} onSaved={() => { setEditTarget(null); load() }} />}
       {archiveTarget && (
         <ConfirmDialog
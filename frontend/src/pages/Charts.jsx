@@ -2,6 +2,7 @@ import { useState, useEffect, useMemo } from 'react'
 import { BarChart, Bar, XAxis, YAxis, Tooltip, ResponsiveContainer, Cell, PieChart, Pie, Legend } from 'recharts'
 import { getCards } from '../api/cards'
 import { useCurrency } from '../context/CurrencyContext'
+import { topN } from '../utils/topN'
 import PageTabs from '../components/PageTabs'
 import pageStyles from './Page.module.css'
 import styles from './Charts.module.css'
@@ -13,6 +14,7 @@ const PORTFOLIO_TABS = [
 
 const TREND_COLORS = { up: '#4caf82', stable: '#4f8ef7', down: '#e05c5c', 'no data': '#9aa0b4' }
 const GRADE_COLORS = ['#4f8ef7','#7c5cbf','#e0a43c','#4caf82','#e05c5c','#9aa0b4']
+const TOOLTIP_STYLE = { background: 'var(--bg-card)', border: '1px solid var(--border)', borderRadius: 8 }
 
 export default function Charts() {
   const [cards,   setCards]   = useState([])
@@ -57,9 +59,7 @@ export default function Charts() {
       const g = c.grade || 'Ungraded'
       counts[g] = (counts[g] || 0) + 1
     })
-    return Object.entries(counts)
-      .sort((a, b) => b[1] - a[1])
-      .slice(0, 8)
+    return topN(Object.entries(counts), 8, ([, n]) => n)
       .map(([name, value]) => ({ name, value }))
   }, [cards])
 
@@ -69,54 +69,38 @@ export default function Charts() {
       const s = c.set_name || 'Unknown'
       counts[s] = (counts[s] || 0) + 1
     })
-    return Object.entries(counts)
-      .sort((a, b) => b[1] - a[1])
-      .slice(0, 10)
+    return topN(Object.entries(counts), 10, ([, n]) => n)
       .map(([name, value]) => ({ name: name.length > 20 ? name.slice(0, 18) + '…' : name, full: name, value }))
   }, [cards])
 
   const costVsValue = useMemo(() =>
-    cards
-      .filter(c => c.cost_basis > 0 && c.fair_value > 0)
-      .map(c => ({
-        name: c.player || c.card_name,
-        cost: c.cost_basis,
-        value: c.fair_value,
-        gain: c.fair_value - c.cost_basis,
-      }))
-      .sort((a, b) => b.gain - a.gain)
-      .slice(0, 15)
+    topN(
+      cards.filter(c => c.cost_basis > 0 && c.fair_value > 0),
+      15,
+      c => c.fair_value - c.cost_basis,
+    ).map(c => ({
+      name: c.player || c.card_name,
+      cost: c.cost_basis,
+      value: c.fair_value,
+      gain: c.fair_value - c.cost_basis,
+    }))
   , [cards])
 
-  const totalValue  = cards.reduce((s, c) => s + (c.fair_value ?? 0), 0)
-  const totalCost   = cards.reduce((s, c) => s + (c.cost_basis  ?? 0), 0)
-  const withData    = cards.filter(c => c.fair_value > 0).length
-  const notFound    = cards.filter(c => c.confidence === 'not found' || c.confidence === 'notfound').length
-
-  if (loading) return <p className={pageStyles.status}>Loading…</p>
-  if (error)   return <p className={pageStyles.error}>Error: {error}</p>
-
-  return (
-    <div className={pageStyles.page}>
-      <PageTabs tabs={PORTFOLIO_TABS} />
-      <div className={pageStyles.header}>
-        <div>
-          <h1 className={pageStyles.title}>Charts & Analytics</h1>
-          <p className={styles.subtitle}>Visual breakdown of your collection</p>
-        </div>
-      </div>
-
-      {/* Summary stats */}
-      <div className={styles.statRow}>
-        <StatCard label="Total Cards"    value={cards.length} />
-        <StatCard label="With Price Data" value={withData} />
-        <StatCard label="Not Found"       value={notFound} color="warn" />
-        <StatCard label="Portfolio Value" value={fmtPrice(totalValue)} />
-        <StatCard label="Total Cost"      value={fmtPrice(totalCost)} />
-        <StatCard label="Unrealized P&L"  value={fmtPrice(totalValue - totalCost)}
-          color={totalValue >= totalCost ? 'success' : 'danger'} />
-      </div>
+  const { totalValue, totalCost, withData, notFound } = useMemo(() => {
+    let totalValue = 0, totalCost = 0, withData = 0, notFound = 0
+    for (const c of cards) {
+      totalValue += c.fair_value ?? 0
+      totalCost  += c.cost_basis ?? 0
+      if (c.fair_value > 0) withData++
+      if (c.confidence === 'not found' || c.confidence === 'notfound') notFound++
+    }
+    return { totalValue, totalCost, withData, notFound }
+  }, [cards])
 
+  // Chart element trees only depend on the derived datasets — memoizing them
+  // lets React skip re-reconciling every recharts subtree on unrelated renders.
+  const charts = useMemo(() => (
+    <>
       {/* Price Distribution */}
       <div className={styles.chartSection}>
         <h2 className={styles.chartTitle}>Value Distribution</h2>
@@ -126,7 +110,7 @@ export default function Charts() {
             <XAxis dataKey="label" tick={{ fill: '#9aa0b4', fontSize: 11 }} />
             <YAxis tick={{ fill: '#9aa0b4', fontSize: 11 }} />
             <Tooltip
-              contentStyle={{ background: 'var(--bg-card)', border: '1px solid var(--border)', borderRadius: 8 }}
+              contentStyle={TOOLTIP_STYLE}
               formatter={v => [`${v} cards`, 'Count']}
             />
             <Bar dataKey="count" radius={[6,6,0,0]}>
@@ -152,7 +136,7 @@ export default function Charts() {
                   <Cell key={i} fill={TREND_COLORS[entry.name] || '#9aa0b4'} />
                 ))}
               </Pie>
-              <Tooltip contentStyle={{ background: 'var(--bg-card)', border: '1px solid var(--border)', borderRadius: 8 }} />
+              <Tooltip contentStyle={TOOLTIP_STYLE} />
             </PieChart>
           </ResponsiveContainer>
         </div>
@@ -163,7 +147,7 @@ export default function Charts() {
             <BarChart data={gradeData} layout="vertical" margin={{ top: 4, right: 16, left: 60, bottom: 4 }}>
               <XAxis type="number" tick={{ fill: '#9aa0b4', fontSize: 11 }} />
               <YAxis type="category" dataKey="name" tick={{ fill: '#9aa0b4', fontSize: 11 }} width={58} />
-              <Tooltip contentStyle={{ background: 'var(--bg-card)', border: '1px solid var(--border)', borderRadius: 8 }} />
+              <Tooltip contentStyle={TOOLTIP_STYLE} />
               <Bar dataKey="value" radius={[0,6,6,0]}>
                 {gradeData.map((_, i) => <Cell key={i} fill={GRADE_COLORS[i % GRADE_COLORS.length]} />)}
               </Bar>
@@ -181,7 +165,7 @@ export default function Charts() {
             <XAxis dataKey="name" tick={{ fill: '#9aa0b4', fontSize: 10 }} angle={-30} textAnchor="end" interval={0} />
             <YAxis tick={{ fill: '#9aa0b4', fontSize: 11 }} />
             <Tooltip
-              contentStyle={{ background: 'var(--bg-card)', border: '1px solid var(--border)', borderRadius: 8 }}
+              contentStyle={TOOLTIP_STYLE}
               formatter={v => [`${v} cards`, 'Count']}
               labelFormatter={(_, payload) => payload?.[0]?.payload?.full || ''}
             />
@@ -199,7 +183,7 @@ export default function Charts() {
               <XAxis dataKey="name" tick={{ fill: '#9aa0b4', fontSize: 10 }} angle={-35} textAnchor="end" interval={0} />
               <YAxis tick={{ fill: '#9aa0b4', fontSize: 11 }} />
               <Tooltip
-                contentStyle={{ background: 'var(--bg-card)', border: '1px solid var(--border)', borderRadius: 8 }}
+                contentStyle={TOOLTIP_STYLE}
                 formatter={(v, key) => [fmtPrice(v), key === 'cost' ? 'Cost Basis' : 'Fair Value']}
               />
               <Legend wrapperStyle={{ color: '#9aa0b4', fontSize: 12 }} />
@@ -209,6 +193,34 @@ export default function Charts() {
           </ResponsiveContainer>
         </div>
       )}
+    </>
+  ), [priceDistribution, trendData, gradeData, setData, costVsValue, fmtPrice])
+
+  if (loading) return <p className={pageStyles.status}>Loading…</p>
+  if (error)   return <p className={pageStyles.error}>Error: {error}</p>
+
+  return (
+    <div className={pageStyles.page}>
+      <PageTabs tabs={PORTFOLIO_TABS} />
+      <div className={pageStyles.header}>
+        <div>
+          <h1 className={pageStyles.title}>Charts & Analytics</h1>
+          <p className={styles.subtitle}>Visual breakdown of your collection</p>
+        </div>
+      </div>
+
+      {/* Summary stats */}
+      <div className={styles.statRow}>
+        <StatCard label="Total Cards"    value={cards.length} />
+        <StatCard label="With Price Data" value={withData} />
+        <StatCard label="Not Found"       value={notFound} color="warn" />
+        <StatCard label="Portfolio Value" value={fmtPrice(totalValue)} />
+        <StatCard label="Total Cost"      value={fmtPrice(totalCost)} />
+        <StatCard label="Unrealized P&L"  value={fmtPrice(totalValue - totalCost)}
+          color={totalValue >= totalCost ? 'success' : 'danger'} />
+      </div>
+
+      {charts}
     </div>
   )
 }
@@ -1,4 +1,4 @@
-import { useState, useEffect, useMemo } from 'react'
+import { useState, useEffect, useMemo, useRef } from 'react'
 import { ScatterChart, Scatter, XAxis, YAxis, Tooltip, ResponsiveContainer, CartesianGrid,
          BarChart, Bar, Cell, LineChart, Line, Legend } from 'recharts'
 import TrendBadge from '../components/TrendBadge'
@@ -6,6 +6,7 @@ import PriceChart from '../components/PriceChart'
 import { getYoungGuns, getMarketMovers, getNHLStats, getSeasonalTrends,
          getYGPriceHistoryByName, updateYGOwnership, scrapeYGCard } from '../api/masterDb'
 import { useCurrency } from '../context/CurrencyContext'
+import { topN } from '../utils/topN'
 import PageTabs from '../components/PageTabs'
 import styles from './MasterDB.module.css'
 import pageStyles from './Page.module.css'
@@ -38,6 +39,7 @@ export default function MasterDB() {
 
   // Filters
   const [search,     setSearch]     = useState('')
+  const [debouncedSearch, setDebouncedSearch] = useState('')
   const [season,     setSeason]     = useState('')
   const [team,       setTeam]       = useState('')
   const [myCards,    setMyCards]    = useState(false)
@@ -68,17 +70,30 @@ export default function MasterDB() {
   }
   useEffect(load, [])
 
+  // Only re-filter (and re-run every analytics panel) once typing pauses;
+  // clearing applies immediately
+  const debounceRef = useRef(null)
+  useEffect(() => {
+    clearTimeout(debounceRef.current)
+    debounceRef.current = setTimeout(() => setDebouncedSearch(search), search ? 250 : 0)
+    return () => clearTimeout(debounceRef.current)
+  }, [search])
+
+  // Lowercased search text per card, built once per load rather than on
+  // every filter pass
+  const searchKeys = useMemo(() => new Map(cards.map(c => [c,
+    [c.player, c.team, c.set, c.season, c.card_number].join('\n').toLowerCase(),
+  ])), [cards])
+
   const filtered = useMemo(() => {
-    const s = search.toLowerCase()
+    // Every whitespace-separated term must appear, in any order or field
+    const terms = debouncedSearch.toLowerCase().split(/\s+/).filter(Boolean)
     return cards
       .filter(c => {
-        if (s && !(
-          c.player?.toLowerCase().includes(s) ||
-          c.team?.toLowerCase().includes(s) ||
-          c.set?.toLowerCase().includes(s) ||
-          String(c.season).includes(s) ||
-          String(c.card_number).includes(s)
-        )) return false
+        if (terms.length) {
+          const key = searchKeys.get(c)
+          if (!terms.every(t => key.includes(t))) return false
+        }
         if (season && String(c.season) !== season) return false
         if (team   && c.team !== team)              return false
         if (myCards && !c.owned)                    return false
@@ -89,7 +104,7 @@ export default function MasterDB() {
         const bv = b[sortKey] ?? -1
         return sortDir === 'desc' ? bv - av : av - bv
       })
-  }, [cards, search, season, team, myCards, sortKey, sortDir])
+  }, [cards, searchKeys, debouncedSearch, season, team, myCards, sortKey, sortDir])
 
   const handleSort = key => {
     if (sortKey === key) {
@@ -539,7 +554,7 @@ function YGCardDetail({ card, nhlStats, fmt, onOwnershipSaved }) {
                 formatter={(v, k) => [k === 'price' ? `$${Number(v).toFixed(2)}` : v, k === 'price' ? 'Price' : 'Scrape #']}
                 labelFormatter={(_, payload) => payload?.[0]?.payload?.date || ''}
               />
-              <Scatter data={scatterPoints} fill="#4caf82" opacity={0.85} />
+              <Scatter data={scatterPoints} fill="#4caf82" opacity={0.85} isAnimationActive={false} />
             </ScatterChart>
           </ResponsiveContainer>
 
@@ -677,15 +692,18 @@ function AccordionSection({ title, sectionKey, open, toggle, children }) {
 }
 
 function MarketOverview({ cards, filtered, priceMode, fmt }) {
-  const withPrice  = cards.filter(c => (c[priceMode] ?? 0) > 0)
-  const prices     = withPrice.map(c => c[priceMode])
-  const total      = prices.reduce((s, v) => s + v, 0)
-  const avg        = prices.length ? total / prices.length : 0
-  const median     = prices.length ? [...prices].sort((a, b) => a - b)[Math.floor(prices.length / 2)] : 0
-  const max        = prices.length ? Math.max(...prices) : 0
-  const topCard    = withPrice.find(c => c[priceMode] === max)
-  const trending   = { up: 0, stable: 0, down: 0 }
-  cards.forEach(c => { if (c.trend in trending) trending[c.trend]++ })
+  const { withPrice, avg, median, max, topCard, trending } = useMemo(() => {
+    const withPrice  = cards.filter(c => (c[priceMode] ?? 0) > 0)
+    const prices     = withPrice.map(c => c[priceMode])
+    const total      = prices.reduce((s, v) => s + v, 0)
+    const avg        = prices.length ? total / prices.length : 0
+    const median     = prices.length ? [...prices].sort((a, b) => a - b)[Math.floor(prices.length / 2)] : 0
+    const max        = prices.length ? Math.max(...prices) : 0
+    const topCard    = withPrice.find(c => c[priceMode] === max)
+    const trending   = { up: 0, stable: 0, down: 0 }
+    cards.forEach(c => { if (c.trend in trending) trending[c.trend]++ })
+    return { withPrice, avg, median, max, topCard, trending }
+  }, [cards, priceMode])
 
   return (
     <div className={styles.overviewGrid}>
@@ -701,22 +719,26 @@ function MarketOverview({ cards, filtered, priceMode, fmt }) {
   )
 }
 
+const PRICE_BUCKETS = [
+  { label: 'Under $5',    min: 0,   max: 5    },
+  { label: '$5–$15',      min: 5,   max: 15   },
+  { label: '$15–$30',     min: 15,  max: 30   },
+  { label: '$30–$50',     min: 30,  max: 50   },
+  { label: '$50–$100',    min: 50,  max: 100  },
+  { label: '$100–$250',   min: 100, max: 250  },
+  { label: 'Over $250',   min: 250, max: Infinity },
+]
+
 function PriceAnalysis({ cards, priceMode, priceLabel, fmt }) {
-  const withPrice = cards.filter(c => (c[priceMode] ?? 0) > 0)
-  const buckets = [
-    { label: 'Under $5',    min: 0,   max: 5    },
-    { label: '$5–$15',      min: 5,   max: 15   },
-    { label: '$15–$30',     min: 15,  max: 30   },
-    { label: '$30–$50',     min: 30,  max: 50   },
-    { label: '$50–$100',    min: 50,  max: 100  },
-    { label: '$100–$250',   min: 100, max: 250  },
-    { label: 'Over $250',   min: 250, max: Infinity },
-  ]
-  const counts = buckets.map(b => ({
-    ...b,
-    count: withPrice.filter(c => c[priceMode] >= b.min && c[priceMode] < b.max).length,
-  }))
-  const maxCount = Math.max(...counts.map(b => b.count), 1)
+  const { withPrice, counts, maxCount } = useMemo(() => {
+    const withPrice = cards.filter(c => (c[priceMode] ?? 0) > 0)
+    const counts = PRICE_BUCKETS.map(b => ({
+      ...b,
+      count: withPrice.filter(c => c[priceMode] >= b.min && c[priceMode] < b.max).length,
+    }))
+    const maxCount = Math.max(...counts.map(b => b.count), 1)
+    return { withPrice, counts, maxCount }
+  }, [cards, priceMode])
 
   return (
     <div className={styles.priceAnalysis}>
@@ -734,34 +756,35 @@ function PriceAnalysis({ cards, priceMode, priceLabel, fmt }) {
   )
 }
 
+const GRADE_MODES = [
+  { key: 'psa10_price', label: 'PSA 10', salesKey: 'psa10_sales' },
+  { key: 'psa9_price',  label: 'PSA 9',  salesKey: 'psa9_sales' },
+  { key: 'psa8_price',  label: 'PSA 8',  salesKey: 'psa8_sales' },
+  { key: 'bgs10_price', label: 'BGS 10', salesKey: 'bgs10_sales' },
+  { key: 'bgs95_price', label: 'BGS 9.5',salesKey: 'bgs95_sales' },
+  { key: 'bgs9_price',  label: 'BGS 9',  salesKey: 'bgs9_sales' },
+]
+
 function GradingAnalytics({ cards, fmt }) {
-  const modes = [
-    { key: 'psa10_price', label: 'PSA 10', salesKey: 'psa10_sales' },
-    { key: 'psa9_price',  label: 'PSA 9',  salesKey: 'psa9_sales' },
-    { key: 'psa8_price',  label: 'PSA 8',  salesKey: 'psa8_sales' },
-    { key: 'bgs10_price', label: 'BGS 10', salesKey: 'bgs10_sales' },
-    { key: 'bgs95_price', label: 'BGS 9.5',salesKey: 'bgs95_sales' },
-    { key: 'bgs9_price',  label: 'BGS 9',  salesKey: 'bgs9_sales' },
-  ]
+  const gradeStats = useMemo(() => GRADE_MODES.map(({ key, label }) => {
+    const withData = cards.filter(c => (c[key] ?? 0) > 0)
+    const prices   = withData.map(c => c[key])
+    const avg      = prices.length ? prices.reduce((s, v) => s + v, 0) / prices.length : 0
+    const raw      = cards.filter(c => c.fair_value > 0 && c[key] > 0)
+    const avgMult  = raw.length ? raw.reduce((s, c) => s + c[key] / c.fair_value, 0) / raw.length : 0
+    return { key, label, avg, count: withData.length, avgMult }
+  }), [cards])
 
   return (
     <div className={styles.gradingGrid}>
-      {modes.map(({ key, label, salesKey }) => {
-        const withData = cards.filter(c => (c[key] ?? 0) > 0)
-        const prices   = withData.map(c => c[key])
-        const avg      = prices.length ? prices.reduce((s, v) => s + v, 0) / prices.length : 0
-        const raw      = cards.filter(c => c.fair_value > 0 && c[key] > 0)
-        const avgMult  = raw.length ? raw.reduce((s, c) => s + c[key] / c.fair_value, 0) / raw.length : 0
-
-        return (
-          <div key={key} className={styles.gradeCard}>
-            <span className={styles.gradeLabel}>{label}</span>
-            <span className={styles.gradeAvg}>{fmt(avg)}</span>
-            <span className={styles.gradeCount}>{withData.length} cards</span>
-            {avgMult > 0 && <span className={styles.gradeMult}>{avgMult.toFixed(1)}× raw</span>}
-          </div>
-        )
-      })}
+      {gradeStats.map(({ key, label, avg, count, avgMult }) => (
+        <div key={key} className={styles.gradeCard}>
+          <span className={styles.gradeLabel}>{label}</span>
+          <span className={styles.gradeAvg}>{fmt(avg)}</span>
+          <span className={styles.gradeCount}>{count} cards</span>
+          {avgMult > 0 && <span className={styles.gradeMult}>{avgMult.toFixed(1)}× raw</span>}
+        </div>
+      ))}
     </div>
   )
 }
@@ -949,6 +972,8 @@ function CorrelationAnalytics({ nhlStats, priceMode, fmt }) {
         ))}
       </div>
 
+      {/* Scatters skip Recharts' per-point mount animation — with hundreds of
+          SVG dots it stalls every tab/axis switch */}
       {tab === 'goalies' ? (
         <>
           <div className={styles.corrTabs} style={{ marginTop: 8 }}>
@@ -985,7 +1010,7 @@ function CorrelationAnalytics({ nhlStats, priceMode, fmt }) {
                   formatter={(v, k) => [k === 'value' ? `$${Number(v).toFixed(2)}` : (typeof v === 'number' ? v.toFixed(3) : v), k === 'value' ? 'Card Value' : goalieXLabel]}
                   labelFormatter={(_, payload) => payload?.[0]?.payload?.name || ''}
                 />
-                <Scatter data={goalieData} fill="#e8a838" opacity={0.8} />
+                <Scatter data={goalieData} fill="#e8a838" opacity={0.8} isAnimationActive={false} />
               </ScatterChart>
             </ResponsiveContainer>
           )}
@@ -1014,7 +1039,7 @@ function CorrelationAnalytics({ nhlStats, priceMode, fmt }) {
                 formatter={(v, k) => [k === 'value' ? `$${v.toFixed(2)}` : v, k === 'value' ? 'Card Value' : xLabel]}
                 labelFormatter={(_, payload) => payload?.[0]?.payload?.name || ''}
               />
-              <Scatter data={scatterData} fill="#4f8ef7" opacity={0.7} />
+              <Scatter data={scatterData} fill="#4f8ef7" opacity={0.7} isAnimationActive={false} />
             </ScatterChart>
           </ResponsiveContainer>
 
@@ -1136,8 +1161,8 @@ function ValueFinder({ nhlStats, fmt }) {
     }).filter(p => p.expected > 0)
   }, [nhlStats])
 
-  const overvalued  = useMemo(() => [...data].sort((a, b) => b.premium - a.premium).slice(0, 12), [data])
-  const undervalued = useMemo(() => [...data].sort((a, b) => a.premium - b.premium).slice(0, 12), [data])
+  const overvalued  = useMemo(() => topN(data, 12, p => p.premium), [data])
+  const undervalued = useMemo(() => topN(data, 12, p => -p.premium), [data])
   const rows = tab === 'over' ? overvalued : undervalued
 
   return (
@@ -1304,15 +1329,14 @@ function TeamPremium({ cards, priceMode, priceLabel, fmt }) {
       if (!groups[t]) groups[t] = []
       if ((c[priceMode] ?? 0) > 0) groups[t].push(c[priceMode])
     })
-    return Object.entries(groups)
+    const teams = Object.entries(groups)
       .map(([team, prices]) => ({
         team: team.replace('Hockey Club', '').replace('Hockey Team', '').trim(),
         avg:  prices.length ? prices.reduce((s, v) => s + v, 0) / prices.length : 0,
         count: prices.length,
       }))
       .filter(t => t.count >= 2)
-      .sort((a, b) => b.avg - a.avg)
-      .slice(0, 15)
+    return topN(teams, 15, t => t.avg)
   }, [cards, priceMode])
 
   return (
@@ -5,6 +5,7 @@ import PriceChart from '../components/PriceChart'
 import TrendBadge from '../components/TrendBadge'
 import { getPortfolioHistory, getCards, getCardOfTheDay } from '../api/cards'
 import { useCurrency } from '../context/CurrencyContext'
+import { topN } from '../utils/topN'
 import PageTabs from '../components/PageTabs'
 import pageStyles from './Page.module.css'
 import styles from './Portfolio.module.css'
@@ -44,28 +45,32 @@ export default function Portfolio() {
   const latest = history[history.length - 1]
 
   const stats = useMemo(() => {
-    const totalValue   = cards.reduce((s, c) => s + (c.fair_value ?? 0), 0)
-    const totalCost    = cards.reduce((s, c) => s + (c.cost_basis  ?? 0), 0)
-    const withSales    = cards.filter(c => (c.num_sales ?? 0) > 0).length
-    const gainLoss     = totalValue - totalCost
-    const avgValue     = cards.length ? totalValue / cards.length : 0
-
+    // One pass for the totals, trend counts and the priced / cost-basis
+    // subsets, instead of a separate reduce or filter over cards for each
+    let totalValue = 0, totalCost = 0, withSales = 0
     const trendCounts = { up: 0, stable: 0, down: 0, 'no data': 0 }
-    cards.forEach(c => {
+    const priced = []
+    const withGain = []   // gainers / losers — cards with both cost_basis and fair_value
+    for (const c of cards) {
+      totalValue += c.fair_value ?? 0
+      totalCost  += c.cost_basis ?? 0
+      if ((c.num_sales ?? 0) > 0) withSales++
       const t = (c.trend || 'no data').toLowerCase()
       trendCounts[t in trendCounts ? t : 'no data']++
-    })
+      if (c.fair_value > 0) {
+        priced.push(c)
+        if (c.cost_basis > 0) {
+          withGain.push({ ...c, gain: c.fair_value - c.cost_basis, roi: ((c.fair_value - c.cost_basis) / c.cost_basis) * 100 })
+        }
+      }
+    }
+    const gainLoss = totalValue - totalCost
+    const avgValue = cards.length ? totalValue / cards.length : 0
 
-    const top10 = [...cards]
-      .filter(c => c.fair_value > 0)
-      .sort((a, b) => (b.fair_value ?? 0) - (a.fair_value ?? 0))
-      .slice(0, 10)
+    const top10 = topN(priced, 10, c => c.fair_value)
 
-    // Gainers / losers — cards with both cost_basis and fair_value
-    const withBoth = cards.filter(c => c.cost_basis > 0 && c.fair_value > 0)
-    const withGain = withBoth.map(c => ({ ...c, gain: c.fair_value - c.cost_basis, roi: ((c.fair_value - c.cost_basis) / c.cost_basis) * 100 }))
-    const topGainers = [...withGain].sort((a, b) => b.gain - a.gain).slice(0, 5)
-    const topLosers  = [...withGain].sort((a, b) => a.gain - b.gain).slice(0, 5)
+    const topGainers = topN(withGain, 5, c => c.gain)
+    const topLosers  = topN(withGain, 5, c => -c.gain)
 
     return { totalValue, totalCost, gainLoss, avgValue, withSales, trendCounts, top10, topGainers, topLosers }
   }, [cards])
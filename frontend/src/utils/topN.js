@@ -0,0 +1,16 @@
+// Partial selection: keep only the best `n` items in a small sorted buffer
+// instead of sorting the whole list and slicing. O(len · n) with tiny n,
+// and stable — ties keep their original order, same as sort().slice().
+export function topN(items, n, score) {
+  const best = []
+  if (n <= 0) return best
+  for (const item of items) {
+    const s = score(item)
+    if (best.length === n && s <= best[n - 1].s) continue
+    let i = best.length
+    while (i > 0 && best[i - 1].s < s) i--
+    best.splice(i, 0, { s, item })
+    if (best.length > n) best.pop()
+  }
+  return best.map(b => b.item)
+}
@@ -11,6 +11,8 @@ sys.modules['selenium.webdriver.common.by'] = MagicMock()
 sys.modules['selenium.webdriver.support.ui'] = MagicMock()
 sys.modules['selenium.webdriver.support'] = MagicMock()
 sys.modules['selenium.webdriver.support.expected_conditions'] = MagicMock()
+sys.modules['selenium.common'] = MagicMock()
+sys.modules['selenium.common.exceptions'] = MagicMock(WebDriverException=type('WebDriverException', (Exception,), {}))
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
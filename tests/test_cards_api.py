@@ -0,0 +1,319 @@
+"""Tests for api/routers/cards.py.
+
+Covers:
+ - _read_import_csv engine parity (pyarrow vs C parser)
+ - POST /api/cards/bulk-import (mocked ledger)
+ - POST /api/cards/scrape de-duplication and _do_scrape retry bookkeeping
+ - POST /api/cards duplicate check
+ - GET /api/cards and /api/cards/detail cache invalidation on writes (mocked DB)
+"""
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+import pandas as pd
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+import api.routers.cards as cards_router
+import dashboard_utils
+from api.routers.cards import _read_import_csv
+from test_dashboard_utils import _fake_get_db
+
+
+IMPORT_CSV = (
+    b'Card Name,Fair Value,Cost Basis,Purchase Date,Tags\n'
+    b'2015-16 Upper Deck - Young Guns #201 - Connor McDavid,"$1,234.50",,2024-01-05,\n'
+    b'Existing Card,12,3.5,,rookie\n'
+    b'007,,abc,,\n'
+)
+
+
+@pytest.fixture
+def api_client():
+    from api.main import app
+    return TestClient(app, raise_server_exceptions=True)
+
+
+# ---------------------------------------------------------------------------
+# _read_import_csv
+# ---------------------------------------------------------------------------
+
+@pytest.mark.skipif(not cards_router.HAS_PYARROW, reason="pyarrow not installed")
+class TestReadImportCsv:
+
+    def _read_both(self, content):
+        arrow_df = _read_import_csv(content)
+        with patch.object(cards_router, "HAS_PYARROW", False):
+            c_df = _read_import_csv(content)
+        return arrow_df, c_df
+
+    def test_engines_agree(self):
+        arrow_df, c_df = self._read_both(IMPORT_CSV)
+        pd.testing.assert_frame_equal(arrow_df, c_df)
+
+    def test_columns_are_strings_with_nan_blanks(self):
+        arrow_df, _ = self._read_both(IMPORT_CSV)
+        row = arrow_df.iloc[0]
+        assert row["Purchase Date"] == "2024-01-05"   # not a datetime.date
+        assert row["Fair Value"] == "$1,234.50"
+        assert pd.isna(row["Cost Basis"])              # not ''
+        assert arrow_df.iloc[2]["Card Name"] == "007"  # not the int 7
+
+    def test_ragged_rows_fall_back_to_c_parser(self):
+        with pytest.raises(pd.errors.ParserError, match="C error"):
+            _read_import_csv(b"Card Name,Tags\nA,x\nB,y,z\n")
+
+
+# ---------------------------------------------------------------------------
+# POST /api/cards/bulk-import
+# ---------------------------------------------------------------------------
+
+class TestBulkImport:
+
+    def _import(self, api_client, content):
+        ledger = pd.DataFrame({"Card Name": ["Existing Card"]})
+        saved = []
+        with patch.object(cards_router, "load_data", return_value=ledger), \
+             patch.object(cards_router, "save_data", lambda df, user: saved.append(df)):
+            resp = api_client.post(
+                "/api/cards/bulk-import",
+                files={"file": ("cards.csv", content, "text/csv")},
+            )
+        return resp, saved
+
+    def test_import_rows_match_across_engines(self, api_client):
+        resp, saved = self._import(api_client, IMPORT_CSV)
+        with patch.object(cards_router, "HAS_PYARROW", False):
+            c_resp, c_saved = self._import(api_client, IMPORT_CSV)
+
+        assert resp.status_code == c_resp.status_code == 200
+        assert resp.json() == c_resp.json()
+        assert resp.json()["skipped"] == 1
+        assert saved[0].to_dict(orient="records") == c_saved[0].to_dict(orient="records")
+
+        rows = {r["Card Name"]: r for r in saved[0].to_dict(orient="records")}
+        mcdavid = rows["2015-16 Upper Deck - Young Guns #201 - Connor McDavid"]
+        assert mcdavid["Fair Value"] == 1234.5
+        assert mcdavid["Cost Basis"] == 0.0
+        assert mcdavid["Purchase Date"] == "2024-01-05"
+        assert rows["007"]["Cost Basis"] == 0.0
+
+    def test_malformed_csv_returns_400(self, api_client):
+        resp, saved = self._import(api_client, b"Card Name,Tags\nA,x\nB,y,z\n")
+        assert resp.status_code == 400
+        assert resp.json()["detail"].startswith("Invalid CSV")
+        assert saved == []
+
+
+# ---------------------------------------------------------------------------
+# POST /api/cards/scrape + _do_scrape
+# ---------------------------------------------------------------------------
+
+SCRAPE_CARD = "2015-16 Upper Deck - Young Guns #201 - Connor McDavid"
+
+
+@pytest.fixture
+def recent_scrapes():
+    cards_router._recent_scrapes.clear()
+    yield cards_router._recent_scrapes
+    cards_router._recent_scrapes.clear()
+
+
+class TestScrapeEndpoint:
+
+    def _scrape(self, api_client, **params):
+        return api_client.post(
+            "/api/cards/scrape", params={"name": SCRAPE_CARD, "user": "scrape-user", **params},
+        ).json()["status"]
+
+    def test_queued_then_recent_then_forced(self, api_client, recent_scrapes):
+        do_scrape = MagicMock()
+        with patch.object(cards_router, "card_index", return_value={SCRAPE_CARD: 0}), \
+             patch.object(cards_router, "_do_scrape", do_scrape):
+            assert self._scrape(api_client) == "queued"
+            assert self._scrape(api_client) == "recent"
+            assert self._scrape(api_client, force=True) == "queued"
+        assert do_scrape.call_count == 2
+        assert ("scrape-user", SCRAPE_CARD) in recent_scrapes
+
+    def test_unknown_card_returns_404(self, api_client, recent_scrapes):
+        with patch.object(cards_router, "card_index", return_value={}):
+            resp = api_client.post("/api/cards/scrape", params={"name": "Nope"})
+        assert resp.status_code == 404
+        assert not recent_scrapes
+
+
+class TestDoScrape:
+
+    KEY = ("scrape-user", SCRAPE_CARD)
+    STATS = {"fair_price": 50.0, "num_sales": 3, "trend": "up", "median_all": 48.0,
+             "min": 40.0, "max": 60.0, "top_3_prices": ["$60", "$55", "$50"]}
+
+    def _run(self, stats, ledger_names=(SCRAPE_CARD,)):
+        ledger = pd.DataFrame({
+            "Card Name": list(ledger_names), "Fair Value": 0.0, "Trend": "no data",
+            "Median (All)": 0.0, "Min": 0.0, "Max": 0.0, "Num Sales": 0, "Top 3 Prices": "",
+        })
+        save_data = MagicMock()
+        with patch.object(cards_router, "scrape_single_card", return_value=stats), \
+             patch.object(cards_router, "load_data", return_value=ledger), \
+             patch.object(cards_router, "find_card",
+                          lambda df, user, name: 0 if name in ledger_names else None), \
+             patch.object(cards_router, "append_price_history"), \
+             patch.object(cards_router, "save_data", save_data):
+            cards_router._do_scrape(SCRAPE_CARD, "scrape-user")
+        return save_data
+
+    def test_no_sales_clears_recent_entry(self, recent_scrapes):
+        recent_scrapes[self.KEY] = True
+        save_data = self._run(None)
+        assert self.KEY not in recent_scrapes
+        save_data.assert_not_called()
+
+    def test_removed_card_clears_recent_entry(self, recent_scrapes):
+        recent_scrapes[self.KEY] = True
+        save_data = self._run(self.STATS, ledger_names=())
+        assert self.KEY not in recent_scrapes
+        save_data.assert_not_called()
+
+    def test_error_clears_recent_entry(self, recent_scrapes):
+        recent_scrapes[self.KEY] = True
+        with patch.object(cards_router, "scrape_single_card", side_effect=RuntimeError("boom")):
+            cards_router._do_scrape(SCRAPE_CARD, "scrape-user")
+        assert self.KEY not in recent_scrapes
+
+    def test_success_keeps_recent_entry(self, recent_scrapes):
+        recent_scrapes[self.KEY] = True
+        save_data = self._run(self.STATS)
+        assert self.KEY in recent_scrapes
+        saved = save_data.call_args[0][0].iloc[0]
+        assert saved["Fair Value"] == 50.0
+        assert saved["Num Sales"] == 3
+
+
+# ---------------------------------------------------------------------------
+# POST /api/cards
+# ---------------------------------------------------------------------------
+
+class TestAddCard:
+
+    def _add(self, api_client, name):
+        save_data = MagicMock()
+        with patch.object(cards_router, "card_index", return_value={SCRAPE_CARD: 0}), \
+             patch.object(cards_router, "load_data", side_effect=AssertionError("ledger copied")), \
+             patch.object(cards_router, "save_data", save_data):
+            resp = api_client.post("/api/cards", params={"user": "add-user"},
+                                   json={"card_name": name, "cost_basis": 5.0})
+        return resp, save_data
+
+    def test_duplicate_rejected_from_index(self, api_client):
+        resp, save_data = self._add(api_client, SCRAPE_CARD)
+        assert resp.status_code == 409
+        save_data.assert_not_called()
+
+    def test_new_card_saved(self, api_client):
+        resp, save_data = self._add(api_client, "2023-24 Upper Deck - Young Guns #451 - Connor Bedard")
+        assert resp.status_code == 200
+        saved = save_data.call_args[0][0].iloc[0]
+        assert saved["Card Name"] == "2023-24 Upper Deck - Young Guns #451 - Connor Bedard"
+        assert saved["Cost Basis"] == 5.0
+
+
+# ---------------------------------------------------------------------------
+# Response caches
+# ---------------------------------------------------------------------------
+
+def _card_row(name, fair_value):
+    return {
+        "card_name": name, "fair_value": fair_value, "trend": "stable",
+        "top_3_prices": "", "median_all": fair_value, "min_price": fair_value,
+        "max_price": fair_value, "num_sales": 3, "tags": "", "cost_basis": 1.0,
+        "purchase_date": "", "archived": False,
+    }
+
+
+def _ledger_patches(cards):
+    """Patch get_db/execute_values onto ``cards``, a list of ``cards`` table rows.
+
+    ``SELECT ... FROM cards`` returns the unarchived rows; every other query
+    returns none. ``save_data`` upserts are applied to ``cards`` by card_name.
+    """
+    def fetchall(sql):
+        return [dict(c) for c in cards if not c["archived"]] if "FROM cards" in sql else []
+
+    def execute_values(cur, sql, rows):
+        for _user, *values, _archived in rows:
+            row = dict(zip(dashboard_utils._SAVE_COLS, values))
+            existing = next((c for c in cards if c["card_name"] == row["card_name"]), None)
+            if existing is None:
+                cards.append({**row, "archived": False})
+            else:
+                existing.update(row)
+
+    return (patch("dashboard_utils.get_db", _fake_get_db(fetchall=fetchall)),
+            patch("dashboard_utils.execute_values", execute_values))
+
+
+@pytest.fixture
+def cards_client(api_client):
+    """api_client with the cards router and ledger caches cleared."""
+    for cache in (cards_router._cards_cache, cards_router._detail_cache,
+                  cards_router._history_cache, cards_router._archive_cache,
+                  dashboard_utils._ledger_cache, dashboard_utils._card_index_cache):
+        cache.clear()
+    return api_client
+
+
+class TestCardsCacheInvalidation:
+
+    USER = "cache-test-user"
+    CARD = SCRAPE_CARD
+
+    def _fair_value(self, client):
+        resp = client.get("/api/cards", params={"user": self.USER})
+        assert resp.status_code == 200
+        return resp.json()["cards"][0]["fair_value"]
+
+    def _update(self, client, fair_value):
+        resp = client.patch("/api/cards/update", params={"user": self.USER, "name": self.CARD},
+                            json={"fair_value": fair_value})
+        assert resp.status_code == 200
+
+    def test_list_cards_served_from_cache_until_write(self, cards_client):
+        cards = [_card_row(self.CARD, 100.0)]
+        db_patch, ev_patch = _ledger_patches(cards)
+        with db_patch, ev_patch:
+            assert self._fair_value(cards_client) == 100.0
+
+            # Out-of-band change: no version bump, so the cached body is served
+            cards[0]["fair_value"] = 120.0
+            assert self._fair_value(cards_client) == 100.0
+
+            self._update(cards_client, 150.0)
+            assert self._fair_value(cards_client) == 150.0
+
+    def test_card_detail_refreshes_after_write(self, cards_client):
+        cards = [_card_row(self.CARD, 100.0)]
+        db_patch, ev_patch = _ledger_patches(cards)
+        params = {"user": self.USER, "name": self.CARD}
+        with db_patch, ev_patch:
+            assert cards_client.get("/api/cards/detail", params=params).json()["card"]["fair_value"] == 100.0
+            self._update(cards_client, 150.0)
+            assert cards_client.get("/api/cards/detail", params=params).json()["card"]["fair_value"] == 150.0
+
+    def test_list_cards_drops_archived_card(self, cards_client):
+        cards = [_card_row(self.CARD, 100.0), _card_row("Other Card", 5.0)]
+        db_patch, ev_patch = _ledger_patches(cards)
+        with db_patch, ev_patch:
+            assert len(cards_client.get("/api/cards", params={"user": self.USER}).json()["cards"]) == 2
+
+            resp = cards_client.delete("/api/cards/archive",
+                                       params={"user": self.USER, "name": self.CARD})
+            assert resp.status_code == 200
+            cards[0]["archived"] = True  # what the UPDATE would have done
+
+            names = [c["card_name"] for c in
+                     cards_client.get("/api/cards", params={"user": self.USER}).json()["cards"]]
+            assert names == ["Other Card"]
@@ -10,6 +10,9 @@ class TestDashboard(unittest.TestCase):
     def setUpClass(cls):
         # Save original sys.modules
         cls.original_modules = sys.modules.copy()
+        # Registered as a cleanup so the mocks below are undone even when
+        # setUpClass fails (tearDownClass is skipped in that case)
+        cls.addClassCleanup(cls._restore_modules)
 
         # ----------------------------------------------------------------------
         # DEFINE MOCKS
@@ -158,7 +161,7 @@ class TestDashboard(unittest.TestCase):
         cls.dashboard = dashboard
 
     @classmethod
-    def tearDownClass(cls):
+    def _restore_modules(cls):
         # Restore original sys.modules
         sys.modules.clear()
         sys.modules.update(cls.original_modules)
@@ -1,14 +1,18 @@
+import io
 import unittest
 from unittest.mock import patch, MagicMock
 import sys
 import os
 import pandas as pd
 import json
+from contextlib import contextmanager
 
 # Add root directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import dashboard_utils
 from dashboard_utils import (
+    WebDriverException,
     analyze_card_images,
     scrape_single_card,
     load_data,
@@ -86,6 +90,53 @@ class TestDashboardUtils(unittest.TestCase):
         self.assertIsNone(stats)
         mock_driver.quit.assert_called_once()
 
+    @patch('dashboard_utils.create_driver', create=True)
+    @patch('dashboard_utils.search_ebay_sold', create=True)
+    def test_scrape_single_card_resets_driver_on_webdriver_error(self, mock_search, mock_create_driver):
+        mock_driver = MagicMock()
+        mock_create_driver.return_value = mock_driver
+        mock_search.side_effect = WebDriverException('chrome not reachable')
+
+        try:
+            with self.assertRaises(WebDriverException):
+                scrape_single_card("Test Card", "testuser")
+
+            mock_driver.set_page_load_timeout.assert_called_once_with(dashboard_utils.DRIVER_PAGE_LOAD_TIMEOUT)
+            mock_driver.set_script_timeout.assert_called_once_with(dashboard_utils.DRIVER_SCRIPT_TIMEOUT)
+            mock_driver.quit.assert_called_once()
+            self.assertIsNone(dashboard_utils._driver)
+            self.assertFalse(dashboard_utils._driver_lock.locked())
+        finally:
+            dashboard_utils._driver = None
+
+    @patch('dashboard_utils.create_driver', create=True)
+    @patch('dashboard_utils.search_ebay_sold', create=True)
+    @patch('dashboard_utils.calculate_fair_price', create=True)
+    @patch('dashboard_utils.save_card_results')
+    def test_scrape_single_card_releases_lock_before_db_work(self, mock_save, mock_calc_fair,
+                                                              mock_search, mock_create_driver):
+        mock_search.return_value = [{'title': 'Card', 'price_val': 100}]
+        mock_calc_fair.return_value = (100, {'fair_price': 100, 'num_sales': 1})
+        lock_held = []
+
+        def load_card_results(username, card_name):
+            lock_held.append(dashboard_utils._driver_lock.locked())
+            return {}
+
+        scraper = MagicMock(extract_serial_run=lambda name: None,
+                            _normalize_shipping=lambda sales: sales)
+        try:
+            with patch.dict(sys.modules, {'scrape_card_prices': scraper}), \
+                 patch('dashboard_utils.load_card_results', load_card_results), \
+                 patch('dashboard_utils._filter_sales_by_variant', lambda name, sales: sales):
+                stats = scrape_single_card("Test Card", "testuser")
+        finally:
+            dashboard_utils._driver = None
+
+        self.assertEqual(stats['fair_price'], 100)
+        self.assertEqual(lock_held, [False])
+        mock_save.assert_called_once()
+
     def test_load_save_data(self):
         # Test with a temporary CSV file
         temp_csv = 'temp_test_data.csv'
@@ -118,5 +169,318 @@ class TestDashboardUtils(unittest.TestCase):
             if os.path.exists(temp_csv):
                 os.remove(temp_csv)
 
+
+def _fake_get_db(fetchone=None, fetchall=None):
+    """Return a get_db() stand-in whose cursor returns ``fetchone``.
+
+    ``fetchall`` is a list of row lists handed out one query at a time, or a
+    callable mapping the last executed SQL to its rows; by default every
+    query returns no rows.
+    """
+    cur = MagicMock()
+    cur.fetchone.return_value = fetchone
+    if fetchall is None:
+        cur.fetchall.return_value = []
+    elif callable(fetchall):
+        cur.fetchall.side_effect = lambda: fetchall(cur.execute.call_args[0][0])
+    else:
+        cur.fetchall.side_effect = fetchall
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cur
+
+    @contextmanager
+    def get_db():
+        yield conn
+
+    return get_db
+
+
+class TestDataVersion(unittest.TestCase):
+    """Every in-process ledger write must bump the user's data version."""
+
+    user = 'version-test-user'
+
+    def _assert_bumps(self, write):
+        before = dashboard_utils.get_data_version(self.user)
+        write()
+        self.assertEqual(dashboard_utils.get_data_version(self.user), before + 1)
+
+    @patch('dashboard_utils.execute_values')
+    @patch('dashboard_utils.get_db', _fake_get_db())
+    def test_save_data_bumps_version(self, _execute_values):
+        df = pd.DataFrame({'Card Name': ['Card A'], 'Fair Value': [10.0]})
+        self._assert_bumps(lambda: save_data(df, self.user))
+
+    @patch('dashboard_utils.get_db', _fake_get_db())
+    def test_save_card_results_bumps_version(self):
+        self._assert_bumps(
+            lambda: dashboard_utils.save_card_results(self.user, 'Card A', raw_sales=[]))
+
+    @patch('dashboard_utils.get_db', _fake_get_db())
+    def test_archive_card_bumps_version(self):
+        df = pd.DataFrame({'Card Name': ['Card A', 'Card B']})
+        self._assert_bumps(lambda: dashboard_utils.archive_card(df, self.user, 'Card A'))
+
+    @patch('dashboard_utils.get_db', _fake_get_db())
+    def test_archive_missing_card_keeps_version(self):
+        df = pd.DataFrame({'Card Name': ['Card A']})
+        before = dashboard_utils.get_data_version(self.user)
+        dashboard_utils.archive_card(df, self.user, 'Card Z')
+        self.assertEqual(dashboard_utils.get_data_version(self.user), before)
+
+    @patch('dashboard_utils.get_db', _fake_get_db(fetchone={'card_name': 'Card A', 'fair_value': 5}))
+    def test_restore_card_bumps_version(self):
+        self._assert_bumps(lambda: dashboard_utils.restore_card(self.user, 'Card A'))
+
+
+class TestLoadDataParsedColumns(unittest.TestCase):
+
+    @staticmethod
+    def _load(names):
+        cards = [
+            {'card_name': name, 'fair_value': 1.0, 'trend': 'up', 'top_3_prices': None,
+             'median_all': 1.0, 'min_price': 1.0, 'max_price': 1.0, 'num_sales': 1,
+             'tags': None, 'cost_basis': None, 'purchase_date': None}
+            for name in names
+        ]
+        with patch('dashboard_utils.get_db', _fake_get_db(fetchall=[cards, []])):
+            return dashboard_utils._load_data_from_db('parse-test-user')
+
+    def test_unparseable_name_fills_blank(self):
+        df = self._load(['???', '2015-16 Upper Deck - Young Guns #201 - Connor McDavid [PSA 10]'])
+        records = df.fillna('').to_dict(orient='records')
+        self.assertEqual([r['Year'] for r in records], ['', '2015-16'])
+        self.assertEqual([r['Set'] for r in records], ['', '2015-16 Upper Deck'])
+        self.assertEqual([r['Grade'] for r in records], ['', 'PSA 10'])
+
+    def test_added_row_accepts_blank_fill(self):
+        # No blank Year/Set/Grade anywhere in the loaded ledger
+        df = self._load([
+            '2015-16 Upper Deck - Young Guns #201 - Connor McDavid [PSA 10]',
+            '2023-24 Upper Deck - Young Guns #451 - Connor Bedard [PSA 9]',
+        ])
+        # A row added after load has NaN parsed columns; serialising the
+        # ledger fills those with '', which every parsed column must accept
+        df.loc[len(df), ['Card Name', 'Trend']] = ['Added Card', 'no data']
+        added = df.fillna('').to_dict(orient='records')[-1]
+        self.assertEqual((added['Year'], added['Set'], added['Grade']), ('', '', ''))
+
+@unittest.skipUnless(dashboard_utils.HAS_PIL, 'Pillow not installed')
+class TestPrepareScanImage(unittest.TestCase):
+
+    @staticmethod
+    def _jpeg(size, orientation=None):
+        from PIL import Image
+        img = Image.new('RGB', size, 'white')
+        exif = Image.Exif()
+        if orientation is not None:
+            exif[0x0112] = orientation
+        buf = io.BytesIO()
+        img.save(buf, 'JPEG', exif=exif.tobytes())
+        return buf.getvalue()
+
+    def _size(self, image_bytes):
+        from PIL import Image
+        return Image.open(io.BytesIO(image_bytes)).size
+
+    def test_small_upright_jpeg_passes_through(self):
+        original = self._jpeg((40, 20))
+        self.assertIs(dashboard_utils.prepare_scan_image(original), original)
+
+    def test_small_rotated_jpeg_is_transposed(self):
+        # Orientation 6 = rotate 90° clockwise to display upright
+        original = self._jpeg((40, 20), orientation=6)
+        prepared = dashboard_utils.prepare_scan_image(original)
+        self.assertEqual(self._size(prepared), (20, 40))
+
+    def test_large_jpeg_is_downscaled(self):
+        edge = dashboard_utils.SCAN_MAX_EDGE
+        prepared = dashboard_utils.prepare_scan_image(self._jpeg((edge * 2, edge)))
+        self.assertEqual(self._size(prepared), (edge, edge // 2))
+
+
+class TestCoerceMoneyCols(unittest.TestCase):
+
+    CASES = [
+        ('$1,234.50', 1234.5),
+        (' $ 7 ', 7.0),
+        ('12', 12.0),
+        ('', 0.0),
+        ('n/a', 0.0),
+        ('$', 0.0),
+        (None, 0.0),
+    ]
+
+    def test_formatted_strings(self):
+        df = pd.DataFrame({'Fair Value': [raw for raw, _ in self.CASES]})
+        values = dashboard_utils._coerce_money_cols(df)['Fair Value'].tolist()
+        for (raw, expected), value in zip(self.CASES, values):
+            with self.subTest(raw=raw):
+                self.assertEqual(value, expected)
+
+    def test_numeric_columns_take_fast_path(self):
+        from decimal import Decimal
+        df = pd.DataFrame({'Min': [Decimal('2.50'), None], 'Max': [3, 4], 'Tags': ['$5', '']})
+        out = dashboard_utils._coerce_money_cols(df)
+        self.assertEqual(out['Min'].tolist(), [2.5, 0.0])
+        self.assertEqual(out['Max'].tolist(), [3, 4])
+        # Non-money columns are left alone
+        self.assertEqual(out['Tags'].tolist(), ['$5', ''])
+
+
+class TestParseJsonObject(unittest.TestCase):
+
+    CASES = [
+        ('{"player_name": "A"}', {'player_name': 'A'}),
+        ('  {"a": {"b": 1}}\n', {'a': {'b': 1}}),
+        ('```json\n{"a": 1}\n```', {'a': 1}),
+        ('Here is the card:\n{"a": 1, "b": {"c": 2}}\nHope that helps!', {'a': 1, 'b': {'c': 2}}),
+        ('[1, 2]', None),
+        ('"just a string"', None),
+        ('42', None),
+        ('Result: [{"a": 1}]', {'a': 1}),
+        ('no json here', None),
+        ('} backwards {', None),
+        ('{"a": 1,}', None),
+        ('', None),
+    ]
+
+    def test_cases(self):
+        for text, expected in self.CASES:
+            with self.subTest(text=text):
+                self.assertEqual(dashboard_utils.parse_json_object(text), expected)
+
+
+class TestImportMoneyColumn(unittest.TestCase):
+    """``_money_column`` from api/routers/cards.py — bulk-import money parsing."""
+
+    CASES = [
+        # (import columns, expected Fair Value per row)
+        ({'Fair Value': ['$1,234.50', '7', '']}, [1234.5, 7.0, 0.0]),
+        ({'fair_value': ['3', 'garbage', None]}, [3.0, 0.0, 0.0]),
+        ({'Fair Value': [10.0, None, None], 'fair_value': ['1', '2', None]}, [10.0, 2.0, 0.0]),
+        ({'Fair Value': ['', '$5', ''], 'fair_value': ['$1', '9', '']}, [1.0, 5.0, 0.0]),
+        ({'Card Name': ['a', 'b', 'c']}, [0.0, 0.0, 0.0]),
+    ]
+
+    def test_cases(self):
+        from api.routers.cards import _money_column
+        for columns, expected in self.CASES:
+            with self.subTest(columns=columns):
+                import_df = pd.DataFrame(columns)
+                values = _money_column(import_df, 'Fair Value', 'fair_value').tolist()
+                self.assertEqual(values, expected)
+
+
+class TestNormalizeTrend(unittest.TestCase):
+
+    CASES = [
+        ('up', 'up'),
+        ('down', 'down'),
+        ('stable', 'stable'),
+        ('no data', 'no data'),
+        ('insufficient data', 'no data'),
+        ('unknown', 'no data'),
+        ('', 'no data'),
+        (None, 'no data'),
+        ('sideways', 'no data'),
+        ('UP', 'no data'),
+    ]
+
+    def test_cases(self):
+        for raw, expected in self.CASES:
+            with self.subTest(raw=raw):
+                self.assertEqual(dashboard_utils.normalize_trend(raw), expected)
+
+    def test_results_fit_trend_dtype(self):
+        values = [dashboard_utils.normalize_trend(raw) for raw, _ in self.CASES]
+        series = pd.Series(values).astype(dashboard_utils.TREND_DTYPE)
+        self.assertFalse(series.isna().any())
+
+
+class TestParseCardNames(unittest.TestCase):
+    """The memoized batch parser must agree with ``parse_card_name`` row for row."""
+
+    NAMES = [
+        # Structured "YEAR SET - SUBSET - PLAYER" names
+        '2015-16 Upper Deck - Young Guns #201 - Connor McDavid',
+        '2015-16 Upper Deck Series 1 #201 - Connor McDavid [PSA 10]',
+        '2015-16 Upper Deck Series 1 - Connor McDavid',
+        '2020-21 Upper Deck Series 1 #201 - Alexis Lafreniere - Red Prism',
+        '2023-24 Upper Deck - Young Guns #201 - Connor Bedard [PSA 9] /99',
+        '2023-24 SP Authentic - Future Watch #CU-SC - Connor Bedard - #70/99 - [BGS 9.5]',
+        '2023-24 Upper Deck - [PSA 10] - #12',
+        # Freeform names
+        '1979 O-Pee-Chee Wayne Gretzky',
+        '2015 Connor McDavid PSA 10 Gem Mint',
+        '2015-16 UD Connor McDavid Young Guns #201',
+        '2019-20 Panini Prizm Luka Doncic Silver',
+        '2023 Topps Chrome Mike Trout Auto /99 PSA 9',
+        'Connor Bedard [PSA 10]',
+        'Connor Bedard psa 9 #1/250',
+        # Degenerate input
+        '', None, 42,
+    ]
+
+    def test_matches_parse_card_name(self):
+        # Twice over, so the second pass is served from the memo
+        batch = dashboard_utils.parse_card_names(self.NAMES * 2)
+        for name, parsed in zip(self.NAMES * 2, batch):
+            with self.subTest(name=name):
+                self.assertEqual(parsed, dashboard_utils.parse_card_name(name))
+
+    def test_bracketed_grade_and_freeform(self):
+        structured, freeform = dashboard_utils.parse_card_names([
+            '2015-16 Upper Deck Series 1 #201 - Connor McDavid [PSA 10]',
+            'Connor Bedard psa 9 #1/250',
+        ])
+        self.assertEqual(structured['Grade'], 'PSA 10')
+        self.assertEqual(structured['Player'], 'Connor McDavid')
+        self.assertEqual(structured['Card #'], '201')
+        self.assertEqual(freeform['Grade'], 'psa 9')
+        self.assertEqual(freeform['Serial'], '1/250')
+        self.assertEqual(freeform['Player'], 'Connor Bedard')
+
+    def test_results_are_independent(self):
+        first, = dashboard_utils.parse_card_names(['Connor Bedard [PSA 10]'])
+        first['Player'] = 'changed'
+        again, = dashboard_utils.parse_card_names(['Connor Bedard [PSA 10]'])
+        self.assertEqual(again['Player'], 'Connor Bedard')
+
+
+class TestFindCard(unittest.TestCase):
+
+    user = 'find-card-user'
+
+    def setUp(self):
+        self.names = ['Card A', 'Card B', 'Card C']
+        loader = patch('dashboard_utils._load_data_from_db',
+                       lambda username: pd.DataFrame({'Card Name': list(self.names)}))
+        loader.start()
+        self.addCleanup(loader.stop)
+        dashboard_utils.bump_data_version(self.user)
+
+    def test_hit(self):
+        df = load_data(self.user)
+        self.assertEqual(dashboard_utils.find_card(df, self.user, 'Card B'), 1)
+
+    def test_miss_at_same_version_skips_scan(self):
+        df = load_data(self.user)
+        self.assertIsNone(dashboard_utils.find_card(df, self.user, 'Card Z'))
+        # The index is trusted: a row the index has never seen isn't scanned for
+        df.loc[len(df), 'Card Name'] = 'Card Z'
+        self.assertIsNone(dashboard_utils.find_card(df, self.user, 'Card Z'))
+
+    def test_stale_index_falls_back_to_scan(self):
+        df = load_data(self.user)
+        # A write lands between load_data and find_card, removing Card A and
+        # shifting the other rows
+        self.names.remove('Card A')
+        dashboard_utils.bump_data_version(self.user)
+        self.assertEqual(dashboard_utils.find_card(df, self.user, 'Card A'), 0)
+        self.assertEqual(dashboard_utils.find_card(df, self.user, 'Card C'), 2)
+        self.assertIsNone(dashboard_utils.find_card(df, self.user, 'Card Z'))
+
+
 if __name__ == '__main__':
     unittest.main()
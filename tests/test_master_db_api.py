@@ -0,0 +1,80 @@
+"""Tests for api/routers/master_db.py.
+
+Covers:
+ - POST /api/master-db/scrape and the _do_yg_scrape background task (mocked master DB)
+"""
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+import pandas as pd
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+import api.routers.master_db as master_router
+
+
+CARD_NAME = "2020-21 Upper Deck - Young Guns #201 - Alexis Lafreniere"
+STATS = {"fair_price": 85.0, "trend": "up", "min": 70.0, "max": 99.0, "num_sales": 6}
+
+
+@pytest.fixture
+def api_client():
+    from api.main import app
+    return TestClient(app, raise_server_exceptions=True)
+
+
+def _master_db():
+    return pd.DataFrame({
+        "PlayerName": ["Alexis Lafreniere", "Kirby Dach"],
+        "Season": ["2020-21", "2019-20"],
+        "CardName": [CARD_NAME, "2019-20 Upper Deck - Young Guns #233 - Kirby Dach"],
+        "FairValue": [0.0, 12.0], "Trend": ["", "down"], "Min": [0.0, 10.0],
+        "Max": [0.0, 14.0], "NumSales": [0, 4], "LastScraped": ["", "2024-01-01"],
+    })
+
+
+class TestYgScrape:
+
+    def _scrape(self, api_client, stats, **params):
+        scrape = MagicMock(return_value=stats)
+        save = MagicMock()
+        with patch.object(master_router, "load_master_db", side_effect=_master_db), \
+             patch.object(master_router, "scrape_single_card", scrape), \
+             patch.object(master_router, "save_master_db", save):
+            resp = api_client.post(
+                "/api/master-db/scrape",
+                params={"player": "Alexis Lafreniere", "season": "2020-21", **params},
+            )
+        return resp, scrape, save
+
+    def test_scrapes_as_default_user(self, api_client):
+        resp, scrape, _ = self._scrape(api_client, STATS)
+        assert resp.status_code == 200
+        assert resp.json() == {"status": "queued", "card": CARD_NAME}
+        scrape.assert_called_once_with(CARD_NAME, master_router.DEFAULT_USER)
+
+    def test_scrapes_as_requested_user(self, api_client):
+        _, scrape, _ = self._scrape(api_client, STATS, user="collector")
+        scrape.assert_called_once_with(CARD_NAME, "collector")
+
+    def test_writes_stats_to_master_db(self, api_client):
+        _, _, save = self._scrape(api_client, STATS)
+        saved = save.call_args[0][0]
+        row = saved[saved["PlayerName"] == "Alexis Lafreniere"].iloc[0]
+        assert row["FairValue"] == 85.0
+        assert row["NumSales"] == 6
+        assert row["Trend"] == "up"
+        # Other rows untouched
+        assert saved[saved["PlayerName"] == "Kirby Dach"].iloc[0]["FairValue"] == 12.0
+
+    def test_no_sales_leaves_master_db(self, api_client):
+        _, _, save = self._scrape(api_client, None)
+        save.assert_not_called()
+
+    def test_unknown_card_returns_404(self, api_client):
+        with patch.object(master_router, "load_master_db", side_effect=_master_db):
+            resp = api_client.post("/api/master-db/scrape",
+                                   params={"player": "Nobody", "season": "2020-21"})
+        assert resp.status_code == 404
@@ -0,0 +1,108 @@
+"""Tests for api/routers/scan.py.
+
+Covers:
+ - POST /api/scan/analyze-batch (mocked Anthropic client)
+"""
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import base64
+import json
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+import api.routers.scan as scan_router
+
+
+CARD_JSON = json.dumps({
+    "player_name": "Connor McDavid", "card_number": "201", "brand": "Upper Deck",
+    "subset": "Young Guns", "parallel": "", "year": "2015-16", "serial_number": "",
+    "grade": "", "confidence": "high", "is_sports_card": True, "validation_reason": "ok",
+})
+
+
+def _mock_client():
+    """Anthropic client stand-in: answers CARD_JSON, fails on images containing b'boom'."""
+    def create(**kwargs):
+        image = kwargs["messages"][0]["content"][1]["source"]["data"]
+        if b"boom" in base64.standard_b64decode(image):
+            raise RuntimeError("upstream error")
+        message = MagicMock()
+        message.content = [MagicMock(text=CARD_JSON)]
+        return message
+
+    client = MagicMock()
+    client.messages.create.side_effect = create
+    return client
+
+
+@pytest.fixture
+def scan_client():
+    """TestClient plus the mocked Anthropic client behind _get_client()."""
+    from api.main import app
+    scan_router._source_cache.clear()
+    client = _mock_client()
+    with patch.object(scan_router, "_get_client", return_value=client):
+        yield TestClient(app, raise_server_exceptions=True), client
+    scan_router._source_cache.clear()
+
+
+def _files(*items):
+    """Multipart 'files' entries from (filename, bytes[, content_type]) tuples."""
+    return [("files", (name, data, ctype[0] if ctype else "image/jpeg"))
+            for name, data, *ctype in items]
+
+
+class TestAnalyzeBatch:
+
+    def test_results_in_upload_order(self, scan_client):
+        api_client, client = scan_client
+        resp = api_client.post("/api/scan/analyze-batch",
+                               files=_files(("a.jpg", b"card-a"), ("b.jpg", b"card-b")))
+        assert resp.status_code == 200
+        results = resp.json()["results"]
+        assert [r["filename"] for r in results] == ["a.jpg", "b.jpg"]
+        assert all(r["player_name"] == "Connor McDavid" for r in results)
+        assert all(r["parse_error"] is False for r in results)
+        assert client.messages.create.call_count == 2
+
+    def test_too_many_files_rejected(self, scan_client):
+        api_client, client = scan_client
+        files = _files(*[(f"{i}.jpg", b"card") for i in range(scan_router.MAX_BATCH_FILES + 1)])
+        resp = api_client.post("/api/scan/analyze-batch", files=files)
+        assert resp.status_code == 400
+        assert "Too many files" in resp.json()["detail"]
+        client.messages.create.assert_not_called()
+
+    def test_unsupported_type_rejects_batch(self, scan_client):
+        api_client, client = scan_client
+        resp = api_client.post("/api/scan/analyze-batch",
+                               files=_files(("a.jpg", b"card-a"), ("notes.txt", b"hi", "text/plain")))
+        assert resp.status_code == 400
+        assert "Unsupported file type" in resp.json()["detail"]
+        client.messages.create.assert_not_called()
+
+    def test_oversized_file_rejects_batch(self, scan_client):
+        api_client, client = scan_client
+        with patch.object(scan_router, "MAX_SIZE_BYTES", 8):
+            resp = api_client.post("/api/scan/analyze-batch",
+                                   files=_files(("a.jpg", b"card"), ("big.jpg", b"much-too-large")))
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "big.jpg image too large (max 20MB)"
+        client.messages.create.assert_not_called()
+
+    def test_failing_item_does_not_fail_batch(self, scan_client):
+        api_client, _ = scan_client
+        resp = api_client.post("/api/scan/analyze-batch",
+                               files=_files(("a.jpg", b"card-a"), ("bad.jpg", b"boom"),
+                                            ("c.jpg", b"card-c")))
+        assert resp.status_code == 200
+        results = resp.json()["results"]
+        assert [r["filename"] for r in results] == ["a.jpg", "bad.jpg", "c.jpg"]
+        assert results[1]["parse_error"] is True
+        assert results[1]["error"] == "upstream error"
+        assert results[0]["player_name"] == results[2]["player_name"] == "Connor McDavid"
+        assert "error" not in results[0]
@@ -355,3 +355,4 @@ class TestTrendingEndpoint:
         with patch("api.routers.search.get_db", mock_db):
             resp = api_client.get("/api/search/trending?limit=5")
         assert resp.status_code == 200
+